@@ -0,0 +1,197 @@
+"""
+Bulk article import and export as NDJSON (one JSON object per line).
+
+``ArticleImporter`` validates each line with ``ArticleCreate`` and inserts
+valid rows in batches with a single multi-row INSERT (``executemany``),
+committing per batch. Rows that fail validation or conflict (unknown
+category, duplicate slug) are reported by line number and skipped, so one
+bad row never aborts the rest of the import.
+
+``export_ndjson`` streams articles out through a server-side cursor
+(``yield_per``), so both directions run in constant memory however many
+articles there are. An export can be fed straight back into the import.
+"""
+import json
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError, StatementError
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.models import Article, Category, UploadReference
+from backend.schemas import ArticleCreate
+from backend.uploads import content_upload_urls
+
+
+EXPORT_COLUMNS = (
+    Article.id,
+    Article.title,
+    Article.slug,
+    Article.excerpt,
+    Article.content,
+    Article.url,
+    Article.is_published,
+    Article.is_featured,
+    Article.view_count,
+    Article.order,
+    Article.category_id,
+    Article.created_at,
+    Article.updated_at,
+)
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Split a byte stream into (line number, line) pairs, skipping blank lines."""
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in e['loc']) or 'line'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+class ArticleImporter:
+    """
+    Collects validated article rows and inserts them ``batch_size`` at a time.
+
+    ``add`` is cheap and returns True once a batch is ready; ``flush`` does
+    the database work and should run off the event loop. ``on_inserted`` is
+    called with each inserted ``Article``, e.g. to update the search index.
+    The session factory must not expire objects on commit.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        batch_size: int = 500,
+        on_inserted: Optional[Callable[[Article], None]] = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.on_inserted = on_inserted
+        self.inserted = 0
+        self.errors: List[Dict] = []
+        self._pending: List[Tuple[int, ArticleCreate]] = []
+        self._category_ids: Optional[Set[int]] = None
+
+    def add(self, line_number: int, line: bytes) -> bool:
+        try:
+            payload = ArticleCreate.model_validate_json(line)
+        except ValidationError as e:
+            self.errors.append(
+                {"line": line_number, "error": _format_validation_error(e)})
+        else:
+            self._pending.append((line_number, payload))
+        return len(self._pending) >= self.batch_size
+
+    def flush(self) -> None:
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        with self.session_factory() as db:
+            if self._category_ids is None:
+                self._category_ids = set(db.scalars(select(Category.id)))
+            taken = set(db.scalars(
+                select(Article.slug).where(
+                    Article.slug.in_([payload.slug for _, payload in batch]))
+            ))
+
+            rows = []
+            for line_number, payload in batch:
+                if payload.category_id not in self._category_ids:
+                    self.errors.append(
+                        {"line": line_number, "error": "Category not found"})
+                elif payload.slug in taken:
+                    self.errors.append(
+                        {"line": line_number, "error": "Article with this slug already exists"})
+                else:
+                    taken.add(payload.slug)
+                    rows.append((line_number, payload.model_dump()))
+            if not rows:
+                return
+
+            try:
+                self._insert(db, [row for _, row in rows])
+            except StatementError:
+                # Lost a race with a concurrent writer, or the database
+                # rejected a value (DataError: too long, out of range, ...);
+                # retry row by row to find the offending lines
+                db.rollback()
+                for line_number, row in rows:
+                    try:
+                        self._insert(db, [row])
+                    except IntegrityError:
+                        db.rollback()
+                        self.errors.append(
+                            {"line": line_number, "error": "Article with this slug already exists"})
+                    except StatementError as e:
+                        db.rollback()
+                        self.errors.append(
+                            {"line": line_number, "error": f"Database error: {e.orig}"})
+
+    def _insert(self, db: Session, rows: List[Dict]) -> None:
+        db.execute(insert(Article), rows)
+        articles = db.scalars(
+            select(Article).where(Article.slug.in_([row["slug"] for row in rows]))
+        ).all()
+        references = [
+            {"article_id": article.id, "url": url}
+            for article in articles
+            for url in content_upload_urls(article.content)
+        ]
+        if references:
+            db.execute(insert(UploadReference), references)
+        db.commit()
+        self.inserted += len(rows)
+        if self.on_inserted is not None:
+            for article in articles:
+                self.on_inserted(article)
+
+
+def export_ndjson(
+    session_factory: sessionmaker,
+    category_id: Optional[int] = None,
+    is_published: Optional[bool] = None,
+    batch_size: int = 1000,
+) -> Iterator[bytes]:
+    """Yield articles as NDJSON, one chunk per ``batch_size`` rows."""
+    query = select(*EXPORT_COLUMNS).order_by(Article.id)
+    if category_id is not None:
+        query = query.where(Article.category_id == category_id)
+    if is_published is not None:
+        query = query.where(Article.is_published == is_published)
+
+    with session_factory() as db:
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            yield "".join(
+                json.dumps({
+                    "id": row.id,
+                    "title": row.title,
+                    "slug": row.slug,
+                    "excerpt": row.excerpt,
+                    "content": row.content,
+                    "url": row.url,
+                    "is_published": bool(row.is_published),
+                    "is_featured": bool(row.is_featured),
+                    "view_count": row.view_count,
+                    "order": row.order,
+                    "category_id": row.category_id,
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                    "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+                }, ensure_ascii=False) + "\n"
+                for row in rows
+            ).encode("utf-8")
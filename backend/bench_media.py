@@ -0,0 +1,82 @@
+"""
+Benchmark video range requests: StaticFiles vs MediaFiles.
+
+Writes a throwaway video file, then fires concurrent random ``Range``
+requests (the pattern a seeking player produces) at both apps in-process
+through httpx's ASGI transport and prints throughput and latency.
+
+    python -m backend.bench_media [--size-mb 64] [--requests 400] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from starlette.staticfiles import StaticFiles
+
+from backend.media import MediaFiles
+
+
+async def run(app, name: str, size: int, requests: int, concurrency: int, range_size: int):
+    rng = random.Random(42)
+    ranges = []
+    for _ in range(requests):
+        start = rng.randrange(0, max(1, size - range_size))
+        ranges.append((start, start + range_size - 1))
+
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def fetch(start: int, end: int):
+            async with semaphore:
+                began = time.perf_counter()
+                response = await client.get(
+                    "/bench.mp4", headers={"Range": f"bytes={start}-{end}"})
+                assert response.status_code == 206, response.status_code
+                assert len(response.content) == end - start + 1
+                latencies.append(time.perf_counter() - began)
+
+        began = time.perf_counter()
+        await asyncio.gather(*(fetch(s, e) for s, e in ranges))
+        elapsed = time.perf_counter() - began
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    mb = requests * range_size / (1024 * 1024)
+    print(
+        f"{name:12} {requests / elapsed:8.1f} req/s  {mb / elapsed:8.1f} MB/s  "
+        f"p50 {statistics.median(latencies) * 1000:7.2f} ms  p95 {p95 * 1000:7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--range-kb", type=int, default=1024)
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    range_size = args.range_kb * 1024
+    with tempfile.TemporaryDirectory() as directory:
+        with open(Path(directory) / "bench.mp4", "wb") as f:
+            for _ in range(args.size_mb):
+                f.write(os.urandom(1024 * 1024))
+
+        apps = [
+            ("StaticFiles", StaticFiles(directory=directory)),
+            ("MediaFiles", MediaFiles(Path(directory))),
+        ]
+        for name, app in apps:
+            asyncio.run(run(app, name, size, args.requests, args.concurrency, range_size))
+
+
+if __name__ == "__main__":
+    main()
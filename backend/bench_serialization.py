@@ -0,0 +1,120 @@
+"""
+Benchmark article listing serialization: validated models vs direct dicts.
+
+Builds an in-memory listing of ``--articles`` articles (no database) and
+measures the CPU time of turning it into a response body the old way
+(``ArticleResponse`` objects, ``response_model`` validation, stdlib JSON) and
+the new way (``ArticleMapper`` payloads rendered by orjson), with a cold
+content cache and a warm one. The bodies are checked to be byte-identical
+first.
+
+    python -m backend.bench_serialization [--articles 100] [--iterations 500]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from backend.models import Article, Category
+from backend.schemas import ArticleResponse, ContentBlock, SearchResultCategory
+from backend.serialization import ArticleMapper
+
+
+def make_articles(count: int) -> List[Article]:
+    category = Category(id=1, name="Getting Started", color="#3b82f6")
+    created = datetime(2024, 1, 1, 9, 30)
+    return [
+        Article(
+            id=i,
+            title=f"How to configure feature {i}",
+            slug=f"configure-feature-{i}",
+            excerpt="A short walkthrough of the settings involved.",
+            content=[
+                {
+                    "title": f"Step {step}",
+                    "description": "Open the settings panel and adjust the option. " * 4,
+                    "images": [f"/uploads/images/{i}-{step}.png"],
+                }
+                for step in range(1, 5)
+            ],
+            url=None,
+            is_published=True,
+            is_featured=i % 10 == 0,
+            view_count=i * 7,
+            order=i,
+            created_at=created + timedelta(hours=i),
+            updated_at=created + timedelta(hours=i, minutes=5),
+            category_id=category.id,
+            category=category,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def validated_body(loop, field, articles: List[Article]) -> bytes:
+    """The pre-orjson path: models built by hand, revalidated, stdlib JSON."""
+    models = [
+        ArticleResponse(
+            id=article.id,
+            title=article.title,
+            slug=article.slug,
+            excerpt=article.excerpt,
+            content=[ContentBlock(**block) for block in article.content] if article.content else None,
+            url=article.url,
+            is_published=bool(article.is_published),
+            is_featured=bool(article.is_featured),
+            view_count=article.view_count,
+            order=article.order,
+            created_at=article.created_at,
+            updated_at=article.updated_at,
+            category_id=article.category_id,
+            category=SearchResultCategory(
+                name=article.category.name, color=article.category.color),
+        )
+        for article in articles
+    ]
+    content = loop.run_until_complete(
+        serialize_response(field=field, response_content=models))
+    return JSONResponse(content).body
+
+
+def direct_body(mapper: ArticleMapper, articles: List[Article]) -> bytes:
+    return ORJSONResponse(mapper.to_dicts(articles)).body
+
+
+def measure(name: str, fn, iterations: int) -> float:
+    began = time.process_time()
+    for _ in range(iterations):
+        fn()
+    per_request = (time.process_time() - began) / iterations
+    print(f"{name:10} {per_request * 1000:8.3f} ms CPU/request")
+    return per_request
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    articles = make_articles(args.articles)
+    field = create_model_field(name="Response", type_=List[ArticleResponse], mode="serialization")
+    loop = asyncio.new_event_loop()
+    mapper = ArticleMapper()
+    assert validated_body(loop, field, articles) == direct_body(mapper, articles), "bodies differ"
+
+    old = measure("validated", lambda: validated_body(loop, field, articles), args.iterations)
+    cold = measure("cold", lambda: direct_body(ArticleMapper(), articles), args.iterations)
+    warm = measure("warm", lambda: direct_body(mapper, articles), args.iterations)
+    loop.close()
+    for name, new in (("cold", cold), ("warm", warm)):
+        print(f"saved {name} {(old - new) * 1000:8.3f} ms CPU/request ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
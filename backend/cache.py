@@ -0,0 +1,55 @@
+"""
+Small in-process response caches.
+"""
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class VersionedCache:
+    """
+    Key/value cache that is invalidated by bumping a version number.
+
+    Write endpoints call ``invalidate()`` after committing; every entry stored
+    under an older version is treated as a miss. ``ttl`` bounds how long an
+    entry may be served, which keeps other worker processes (whose writes
+    this process never sees) from serving stale data indefinitely.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._version = 0
+        self._entries: Dict[Hashable, Tuple[int, float, Any]] = {}
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: Hashable = None) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            version, stored_at, value = entry
+            if version != self._version or (
+                self.ttl is not None and time.monotonic() - stored_at > self.ttl
+            ):
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, value: Any, key: Hashable = None, version: Optional[int] = None) -> None:
+        """
+        Store ``value``. Pass the ``version`` read before loading the value so
+        a write that raced with the load does not get cached as current.
+        """
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            self._entries[key] = (self._version, time.monotonic(), value)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
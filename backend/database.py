@@ -0,0 +1,53 @@
+"""
+Database engine configuration.
+
+Request handlers are sync and run in Starlette's threadpool, on their own
+engine and pool; background workers and maintenance scripts (outbox, view
+counter, image variants, reindex, upload GC) use a second, smaller one. Both
+use pymysql for MySQL. ``DATABASE_URL`` stays driver-less; the driver is
+picked here.
+
+Read-only handlers may be routed to replicas (``DATABASE_REPLICA_URLS``,
+see ``replicas``); each replica gets its own engine and pool.
+
+``engine_options`` turns the pool settings into ``create_engine`` keyword
+arguments, using the instrumented pool class from ``pool_metrics``.
+"""
+from typing import Dict
+
+from sqlalchemy.engine import make_url
+
+from backend.pool_metrics import TimedQueuePool
+
+_SYNC_DRIVERS = {"mysql": "mysql+pymysql", "sqlite": "sqlite"}
+
+
+def sync_database_url(url: str) -> str:
+    """``url`` with a blocking driver (pymysql for MySQL)."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if not sep or dialect not in _SYNC_DRIVERS:
+        return url
+    return f"{_SYNC_DRIVERS[dialect]}://{rest}"
+
+
+def engine_options(settings, pool_size: int, url: str = None) -> Dict:
+    """
+    Pool keyword arguments for ``create_engine``.
+    ``url`` defaults to ``DATABASE_URL``; pass a replica URL for its engine.
+    """
+    options = {
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_disconnect_strategy == "pessimistic",
+    }
+    url = make_url(url or settings.database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite needs its default single-connection pool
+        return options
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_size=pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+    )
+    return options
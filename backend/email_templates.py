@@ -0,0 +1,295 @@
+"""
+Email templates, compiled once at import.
+
+Each template is parsed into its literal chunks and field names up front, so
+rendering a message is a single join of the chunks with the per-recipient
+values. HTML templates escape every substituted value.
+"""
+import html
+from string import Formatter
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class CompiledTemplate:
+    """A ``str.format``-style template split into literals and field names."""
+
+    def __init__(self, source: str, escape: Optional[Callable[[str], str]] = None):
+        self.escape = escape
+        self._parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in Formatter().parse(source.strip()):
+            if spec or conversion:
+                raise ValueError(
+                    f"Format specs are not supported in email templates: {field}")
+            self._parts.append((literal, field))
+        self.fields = frozenset(f for _, f in self._parts if f is not None)
+
+    def render(self, values: Dict[str, str]) -> str:
+        escape = self.escape
+        out = []
+        for literal, field in self._parts:
+            out.append(literal)
+            if field is not None:
+                value = str(values[field])
+                out.append(escape(value) if escape else value)
+        return "".join(out)
+
+
+class RenderedEmail(NamedTuple):
+    subject: str
+    text: str
+    html: str
+
+
+class EmailTemplate:
+    """Subject, plain-text and HTML templates for one kind of email."""
+
+    def __init__(self, subject: str, text: str, html_source: str):
+        self.subject = CompiledTemplate(subject)
+        self.text = CompiledTemplate(text)
+        self.html = CompiledTemplate(html_source, escape=html.escape)
+
+    def render(self, values: Dict[str, str]) -> RenderedEmail:
+        return RenderedEmail(
+            self.subject.render(values),
+            self.text.render(values),
+            self.html.render(values),
+        )
+
+    def render_many(self, rows: Iterable[Dict[str, str]]) -> List[RenderedEmail]:
+        """Render one email per dict of values, e.g. for a mass notification."""
+        subject, text, html_template = self.subject, self.text, self.html
+        return [
+            RenderedEmail(
+                subject.render(values),
+                text.render(values),
+                html_template.render(values),
+            )
+            for values in rows
+        ]
+
+
+FEEDBACK_CONFIRMATION = EmailTemplate(
+    subject="Support Request Received - {subject}",
+    text="""
+Hello {name},
+
+Thank you for contacting Albedo Support!
+
+We have received your support request and our team will review it shortly.
+
+Support Request Details:
+------------------------
+Subject: {subject}
+Tracking ID: {token}
+
+Your Message:
+{message}
+
+Track Your Request:
+You can track the status of your request at any time using this link:
+{tracking_url}
+
+We aim to respond within 24 hours. You'll receive an email notification when our team responds.
+
+If you have any urgent concerns, please don't hesitate to reach out to us directly at support@albedoedu.com.
+
+Best regards,
+Albedo Support Team
+
+---
+This is an automated message. Please do not reply to this email.
+""",
+    html_source="""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }}
+        .header {{
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 30px;
+            border-radius: 8px 8px 0 0;
+            text-align: center;
+        }}
+        .content {{
+            background: #f8f9fa;
+            padding: 30px;
+            border-radius: 0 0 8px 8px;
+        }}
+        .details-box {{
+            background: white;
+            padding: 20px;
+            border-radius: 6px;
+            margin: 20px 0;
+            border-left: 4px solid #667eea;
+        }}
+        .tracking-button {{
+            display: inline-block;
+            background: #667eea;
+            color: white;
+            padding: 12px 30px;
+            text-decoration: none;
+            border-radius: 6px;
+            margin: 20px 0;
+        }}
+        .footer {{
+            text-align: center;
+            color: #666;
+            font-size: 12px;
+            margin-top: 30px;
+            padding-top: 20px;
+            border-top: 1px solid #ddd;
+        }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>Support Request Received</h1>
+    </div>
+    <div class="content">
+        <p>Hello {name},</p>
+        
+        <p>Thank you for contacting <strong>Albedo Support</strong>!</p>
+        
+        <p>We have received your support request and our team will review it shortly.</p>
+        
+        <div class="details-box">
+            <h3 style="margin-top: 0;">Support Request Details</h3>
+            <p><strong>Subject:</strong> {subject}</p>
+            <p><strong>Tracking ID:</strong> <code>{token}</code></p>
+            <p><strong>Your Message:</strong></p>
+            <p style="white-space: pre-wrap;">{message}</p>
+        </div>
+        
+        <p style="text-align: center;">
+            <a href="{tracking_url}" class="tracking-button">
+                Track Your Request
+            </a>
+        </p>
+        
+        <p>You can track the status of your request at any time using the button above or this link:</p>
+        <p><a href="{tracking_url}">{tracking_url}</a></p>
+        
+        <p>We aim to respond within <strong>24 hours</strong>. You'll receive an email notification when our team responds.</p>
+        
+        <p>If you have any urgent concerns, please don't hesitate to reach out to us directly at 
+        <a href="mailto:support@albedoedu.com">support@albedoedu.com</a>.</p>
+        
+        <p>Best regards,<br>
+        <strong>Albedo Support Team</strong></p>
+        
+        <div class="footer">
+            This is an automated message. Please do not reply to this email.
+        </div>
+    </div>
+</body>
+</html>
+""",
+)
+
+
+FEEDBACK_RESPONSE = EmailTemplate(
+    subject="Response to Your Support Request - {subject}",
+    text="""
+Hello {name},
+
+Our support team has responded to your request!
+
+Subject: {subject}
+Tracking ID: {token}
+
+Support Team Response:
+{admin_response}
+
+View Full Conversation:
+{tracking_url}
+
+If you have any follow-up questions, please reply to this ticket or contact us at support@albedoedu.com.
+
+Best regards,
+Albedo Support Team
+""",
+    html_source="""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }}
+        .header {{
+            background: linear-gradient(135deg, #10b981 0%, #059669 100%);
+            color: white;
+            padding: 30px;
+            border-radius: 8px 8px 0 0;
+            text-align: center;
+        }}
+        .content {{
+            background: #f8f9fa;
+            padding: 30px;
+            border-radius: 0 0 8px 8px;
+        }}
+        .response-box {{
+            background: white;
+            padding: 20px;
+            border-radius: 6px;
+            margin: 20px 0;
+            border-left: 4px solid #10b981;
+        }}
+        .button {{
+            display: inline-block;
+            background: #10b981;
+            color: white;
+            padding: 12px 30px;
+            text-decoration: none;
+            border-radius: 6px;
+            margin: 20px 0;
+        }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>✓ We've Responded!</h1>
+    </div>
+    <div class="content">
+        <p>Hello {name},</p>
+        
+        <p>Our support team has responded to your request!</p>
+        
+        <div class="response-box">
+            <h3 style="margin-top: 0;">Support Team Response</h3>
+            <p style="white-space: pre-wrap;">{admin_response}</p>
+        </div>
+        
+        <p style="text-align: center;">
+            <a href="{tracking_url}" class="button">
+                View Full Conversation
+            </a>
+        </p>
+        
+        <p><strong>Subject:</strong> {subject}<br>
+        <strong>Tracking ID:</strong> {token}</p>
+        
+        <p>If you have any follow-up questions, please reply to this ticket or contact us at 
+        <a href="mailto:support@albedoedu.com">support@albedoedu.com</a>.</p>
+        
+        <p>Best regards,<br>
+        <strong>Albedo Support Team</strong></p>
+    </div>
+</body>
+</html>
+""",
+)
@@ -1,10 +1,222 @@
 """
 Email utility functions for sending notifications.
 """
+import queue
 import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from backend.settings import get_settings
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from backend.settings import get_settings, Settings
+from backend.email_templates import (
+    EmailTemplate,
+    RenderedEmail,
+    FEEDBACK_CONFIRMATION,
+    FEEDBACK_RESPONSE,
+)
+
+
+class SMTPConnectionPool:
+    """
+    Pool of logged-in SMTP sessions shared by all senders.
+
+    Connections are created lazily up to ``size`` and handed out LIFO so the
+    most recently used (and most likely still alive) session goes first.
+    Sessions idle for longer than ``max_idle`` seconds are checked with NOOP
+    before reuse. A send that fails with ``SMTPServerDisconnected`` is retried
+    once on a newly opened connection; the idle sessions are logged out
+    first, since whatever dropped one (a server restart, an idle timeout)
+    has most likely dropped them too.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        size: int = 4,
+        timeout: float = 30.0,
+        max_idle: float = 60.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            self._discard(server)
+            raise
+        return server
+
+    @staticmethod
+    def _discard(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _is_alive(self, server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+
+    @contextmanager
+    def connection(self, fresh: bool = False) -> Iterator[smtplib.SMTP]:
+        """
+        Check out a logged-in session; it is returned to the pool afterwards.
+        ``fresh`` opens a new one instead of reusing an idle session.
+        """
+        self._slots.acquire()
+        server = None
+        try:
+            if not fresh:
+                try:
+                    server, last_used = self._idle.get_nowait()
+                    if time.monotonic() - last_used > self.max_idle and not self._is_alive(server):
+                        self._discard(server)
+                        server = None
+                except queue.Empty:
+                    pass
+            if server is None:
+                server = self._connect()
+
+            yield server
+            self._idle.put((server, time.monotonic()))
+        except BaseException:
+            # Never hand a session in an unknown state to the next caller
+            if server is not None:
+                self._discard(server)
+            raise
+        finally:
+            self._slots.release()
+
+    def send(self, msg: Message) -> None:
+        """Send one message, reconnecting once if the session was dropped."""
+        self.send_many([msg])
+
+    def send_many(self, messages: List[Message]) -> None:
+        """Send several messages over a single session."""
+        remaining = list(messages)
+        for attempt in range(2):
+            try:
+                # connection() has already discarded the failed session
+                with self.connection(fresh=attempt > 0) as server:
+                    while remaining:
+                        server.send_message(remaining[0])
+                        remaining.pop(0)
+                return
+            except smtplib.SMTPServerDisconnected:
+                if attempt:
+                    raise
+                self.close()
+
+    def close(self) -> None:
+        """Log out of every idle session."""
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(server)
+
+
+_pool: Optional[SMTPConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_smtp_pool(settings: Optional[Settings] = None) -> SMTPConnectionPool:
+    """Return the process-wide SMTP pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            settings = settings or get_settings()
+            _pool = SMTPConnectionPool(
+                host=settings.smtp_host,
+                port=settings.smtp_port,
+                username=settings.smtp_username,
+                password=settings.smtp_password,
+                use_tls=settings.smtp_use_tls,
+                size=settings.smtp_pool_size,
+            )
+        return _pool
+
+
+def close_smtp_pool() -> None:
+    """Close the process-wide SMTP pool if it was ever created."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def build_message(
+    rendered: RenderedEmail,
+    recipient_email: str,
+    settings: Optional[Settings] = None,
+) -> MIMEMultipart:
+    """Wrap a rendered email into a multipart (plain text + HTML) message."""
+    settings = settings or get_settings()
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = rendered.subject
+    msg["From"] = f"{settings.smtp_from_name} <{settings.smtp_from_email}>"
+    msg["To"] = recipient_email
+    msg.attach(MIMEText(rendered.text, "plain"))
+    msg.attach(MIMEText(rendered.html, "html"))
+    return msg
+
+
+def tracking_url(token: str, settings: Optional[Settings] = None) -> str:
+    settings = settings or get_settings()
+    return f"{settings.frontend_url}/support/track/{token}"
+
+
+def send_bulk_email(
+    template: EmailTemplate,
+    recipients: Iterable[Tuple[str, Dict[str, str]]],
+    batch_size: int = 100,
+) -> int:
+    """
+    Render and send one email per (recipient_email, values) pair.
+
+    Messages are rendered in one pass and sent over a single pooled SMTP
+    session per batch. Returns the number of messages sent.
+    """
+    settings = get_settings()
+    recipients = list(recipients)
+    if not settings.enable_email or not settings.smtp_username:
+        print(f"[EMAIL DISABLED] Would send {len(recipients)} bulk email(s)")
+        return 0
+
+    rendered = template.render_many(values for _, values in recipients)
+    messages = [
+        build_message(r, email, settings)
+        for r, (email, _) in zip(rendered, recipients)
+    ]
+    pool = get_smtp_pool(settings)
+    for start in range(0, len(messages), batch_size):
+        pool.send_many(messages[start:start + batch_size])
+    print(f"[EMAIL SENT] {len(messages)} bulk email(s) sent")
+    return len(messages)
 
 
 def send_feedback_confirmation_email(
@@ -30,161 +242,23 @@ def send_feedback_confirmation_email(
     settings = get_settings()
 
     # If email is disabled or not configured, just log and return
-    print(f"Enable email: {settings.enable_email}")
-    print(f"SMTP username: {settings.smtp_username}")
     if not settings.enable_email or not settings.smtp_username:
         print(f"[EMAIL DISABLED] Would send email to {recipient_email}")
-        print(f"Tracking URL: {settings.frontend_url}/support/track/{token}")
+        print(f"Tracking URL: {tracking_url(token, settings)}")
         return True
 
     try:
-        # Create tracking URL
-        tracking_url = f"{settings.frontend_url}/support/track/{token}"
-
-        # Create message
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = f"Support Request Received - {subject}"
-        msg["From"] = f"{settings.smtp_from_name} <{settings.smtp_from_email}>"
-        msg["To"] = recipient_email
-
-        # Create plain text version
-        text_content = f"""
-Hello {recipient_name or 'there'},
-
-Thank you for contacting Albedo Support!
-
-We have received your support request and our team will review it shortly.
-
-Support Request Details:
-------------------------
-Subject: {subject}
-Tracking ID: {token}
-
-Your Message:
-{message}
-
-Track Your Request:
-You can track the status of your request at any time using this link:
-{tracking_url}
-
-We aim to respond within 24 hours. You'll receive an email notification when our team responds.
-
-If you have any urgent concerns, please don't hesitate to reach out to us directly at support@albedoedu.com.
-
-Best regards,
-Albedo Support Team
-
----
-This is an automated message. Please do not reply to this email.
-        """.strip()
-
-        # Create HTML version
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 8px 8px 0 0;
-            text-align: center;
-        }}
-        .content {{
-            background: #f8f9fa;
-            padding: 30px;
-            border-radius: 0 0 8px 8px;
-        }}
-        .details-box {{
-            background: white;
-            padding: 20px;
-            border-radius: 6px;
-            margin: 20px 0;
-            border-left: 4px solid #667eea;
-        }}
-        .tracking-button {{
-            display: inline-block;
-            background: #667eea;
-            color: white;
-            padding: 12px 30px;
-            text-decoration: none;
-            border-radius: 6px;
-            margin: 20px 0;
-        }}
-        .footer {{
-            text-align: center;
-            color: #666;
-            font-size: 12px;
-            margin-top: 30px;
-            padding-top: 20px;
-            border-top: 1px solid #ddd;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>Support Request Received</h1>
-    </div>
-    <div class="content">
-        <p>Hello {recipient_name or 'there'},</p>
-        
-        <p>Thank you for contacting <strong>Albedo Support</strong>!</p>
-        
-        <p>We have received your support request and our team will review it shortly.</p>
-        
-        <div class="details-box">
-            <h3 style="margin-top: 0;">Support Request Details</h3>
-            <p><strong>Subject:</strong> {subject}</p>
-            <p><strong>Tracking ID:</strong> <code>{token}</code></p>
-            <p><strong>Your Message:</strong></p>
-            <p style="white-space: pre-wrap;">{message}</p>
-        </div>
-        
-        <p style="text-align: center;">
-            <a href="{tracking_url}" class="tracking-button">
-                Track Your Request
-            </a>
-        </p>
-        
-        <p>You can track the status of your request at any time using the button above or this link:</p>
-        <p><a href="{tracking_url}">{tracking_url}</a></p>
-        
-        <p>We aim to respond within <strong>24 hours</strong>. You'll receive an email notification when our team responds.</p>
-        
-        <p>If you have any urgent concerns, please don't hesitate to reach out to us directly at 
-        <a href="mailto:support@albedoedu.com">support@albedoedu.com</a>.</p>
-        
-        <p>Best regards,<br>
-        <strong>Albedo Support Team</strong></p>
-        
-        <div class="footer">
-            This is an automated message. Please do not reply to this email.
-        </div>
-    </div>
-</body>
-</html>
-        """.strip()
-
-        # Attach both versions
-        part1 = MIMEText(text_content, "plain")
-        part2 = MIMEText(html_content, "html")
-        msg.attach(part1)
-        msg.attach(part2)
-
-        # Send email
-        with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-            server.starttls()
-            server.login(settings.smtp_username, settings.smtp_password)
-            server.send_message(msg)
+        rendered = FEEDBACK_CONFIRMATION.render({
+            "name": recipient_name or "there",
+            "subject": subject,
+            "message": message,
+            "token": token,
+            "tracking_url": tracking_url(token, settings),
+        })
+
+        # Send email over a pooled session
+        get_smtp_pool(settings).send(
+            build_message(rendered, recipient_email, settings))
 
         print(f"[EMAIL SENT] Confirmation email sent to {recipient_email}")
         return True
@@ -224,118 +298,16 @@ def send_feedback_response_email(
         return True
 
     try:
-        tracking_url = f"{settings.frontend_url}/support/track/{token}"
-
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = f"Response to Your Support Request - {subject}"
-        msg["From"] = f"{settings.smtp_from_name} <{settings.smtp_from_email}>"
-        msg["To"] = recipient_email
-
-        text_content = f"""
-Hello {recipient_name or 'there'},
-
-Our support team has responded to your request!
-
-Subject: {subject}
-Tracking ID: {token}
-
-Support Team Response:
-{admin_response}
-
-View Full Conversation:
-{tracking_url}
-
-If you have any follow-up questions, please reply to this ticket or contact us at support@albedoedu.com.
-
-Best regards,
-Albedo Support Team
-        """.strip()
-
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 8px 8px 0 0;
-            text-align: center;
-        }}
-        .content {{
-            background: #f8f9fa;
-            padding: 30px;
-            border-radius: 0 0 8px 8px;
-        }}
-        .response-box {{
-            background: white;
-            padding: 20px;
-            border-radius: 6px;
-            margin: 20px 0;
-            border-left: 4px solid #10b981;
-        }}
-        .button {{
-            display: inline-block;
-            background: #10b981;
-            color: white;
-            padding: 12px 30px;
-            text-decoration: none;
-            border-radius: 6px;
-            margin: 20px 0;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>✓ We've Responded!</h1>
-    </div>
-    <div class="content">
-        <p>Hello {recipient_name or 'there'},</p>
-        
-        <p>Our support team has responded to your request!</p>
-        
-        <div class="response-box">
-            <h3 style="margin-top: 0;">Support Team Response</h3>
-            <p style="white-space: pre-wrap;">{admin_response}</p>
-        </div>
-        
-        <p style="text-align: center;">
-            <a href="{tracking_url}" class="button">
-                View Full Conversation
-            </a>
-        </p>
-        
-        <p><strong>Subject:</strong> {subject}<br>
-        <strong>Tracking ID:</strong> {token}</p>
-        
-        <p>If you have any follow-up questions, please reply to this ticket or contact us at 
-        <a href="mailto:support@albedoedu.com">support@albedoedu.com</a>.</p>
-        
-        <p>Best regards,<br>
-        <strong>Albedo Support Team</strong></p>
-    </div>
-</body>
-</html>
-        """.strip()
-
-        part1 = MIMEText(text_content, "plain")
-        part2 = MIMEText(html_content, "html")
-        msg.attach(part1)
-        msg.attach(part2)
-
-        with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-            server.starttls()
-            server.login(settings.smtp_username, settings.smtp_password)
-            server.send_message(msg)
+        rendered = FEEDBACK_RESPONSE.render({
+            "name": recipient_name or "there",
+            "subject": subject,
+            "admin_response": admin_response,
+            "token": token,
+            "tracking_url": tracking_url(token, settings),
+        })
+
+        get_smtp_pool(settings).send(
+            build_message(rendered, recipient_email, settings))
 
         print(f"[EMAIL SENT] Response email sent to {recipient_email}")
         return True
@@ -0,0 +1,172 @@
+"""
+Responsive image derivatives.
+
+After an image upload, ``ImageDerivativeWorker`` hands the file to a process
+pool (decoding and resizing are CPU bound) that writes downscaled WebP and,
+where Pillow supports it, AVIF copies next to the original. The variants are
+recorded in ``image_variants`` so article responses can offer a ``srcset``.
+Nothing here runs on the request path; without Pillow the worker is a no-op.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.models import ImageVariant, UploadReference
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional; derivatives are simply skipped
+    Image = None
+    ImageOps = None
+    features = None
+
+
+DERIVATIVE_WIDTHS = (320, 640, 1024, 1600)
+# Raster formats worth re-encoding (SVG is vector, GIF may be animated)
+SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+QUALITY = {"webp": 80, "avif": 60}
+
+
+def supported_formats() -> List[str]:
+    if Image is None:
+        return []
+    return [fmt for fmt in ("avif", "webp") if features.check(fmt)]
+
+
+def generate_derivatives(source: str, formats: List[str]) -> List[Dict]:
+    """
+    Write resized variants of the image at ``source``. Runs in a worker process.
+
+    Only widths smaller than the original are produced. Returns one dict
+    (path, width, format) per file written; existing files are reused. When
+    any were produced, the original itself follows with format "original",
+    so a srcset can offer it as the widest candidate.
+    """
+    source_path = Path(source)
+    variants = []
+    with Image.open(source_path) as original:
+        original.load()
+        # Browsers honour the EXIF orientation of the original; the variants
+        # drop the tag, so rotate the pixels instead
+        original = ImageOps.exif_transpose(original)
+        if original.mode not in ("RGB", "RGBA"):
+            # LA / PA carry an alpha band, P and L may have a transparent colour
+            has_alpha = "A" in original.getbands() or "transparency" in original.info
+            original = original.convert("RGBA" if has_alpha else "RGB")
+        for width in DERIVATIVE_WIDTHS:
+            if width >= original.width:
+                break
+            height = max(1, round(original.height * width / original.width))
+            resized = None
+            for fmt in formats:
+                path = source_path.with_name(f"{source_path.stem}-{width}w.{fmt}")
+                if not path.exists():
+                    if resized is None:
+                        resized = original.resize(
+                            (width, height), Image.Resampling.LANCZOS)
+                    tmp = path.with_name(f".{path.name}.tmp")
+                    resized.save(tmp, format=fmt.upper(), quality=QUALITY[fmt])
+                    tmp.replace(path)
+                variants.append({"path": str(path), "width": width, "format": fmt})
+        if variants:
+            variants.append({"path": str(source_path), "width": original.width, "format": "original"})
+    return variants
+
+
+class ImageDerivativeWorker:
+    """Submits uploaded images to a process pool and records the results."""
+
+    def __init__(self, session_factory: sessionmaker, upload_dir: Path, workers: int = 2):
+        self.session_factory = session_factory
+        self.upload_dir = upload_dir
+        self.workers = workers
+        self.formats = supported_formats()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.formats) and self.workers > 0
+
+    def start(self) -> None:
+        if self.enabled and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, url: str) -> Optional[Future]:
+        """Queue derivative generation for an uploaded image URL."""
+        if self._executor is None or Path(url).suffix.lower() not in SOURCE_EXTENSIONS:
+            return None
+        source = self.upload_dir / url.removeprefix("/uploads/")
+        future = self._executor.submit(
+            generate_derivatives, str(source), self.formats)
+        future.add_done_callback(lambda f: self._record(url, f))
+        return future
+
+    def _record(self, source_url: str, future: Future) -> None:
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"[IMAGE ERROR] Failed to process {source_url}: {str(error)}")
+            return
+
+        base = self.upload_dir.resolve()
+        with self.session_factory() as db:
+            existing = {
+                v.url for v in db.query(ImageVariant).filter(
+                    ImageVariant.source_url == source_url)
+            }
+            for variant in future.result():
+                relative = Path(variant["path"]).resolve().relative_to(base)
+                url = f"/uploads/{relative.as_posix()}"
+                if url in existing:
+                    continue
+                db.add(ImageVariant(
+                    source_url=source_url,
+                    url=url,
+                    width=variant["width"],
+                    format=variant["format"],
+                ))
+            db.commit()
+
+
+def variants_for(db: Session, urls: Iterable[str]) -> Dict[str, List[ImageVariant]]:
+    """Recorded variants of each image URL, narrowest first."""
+    urls = list(urls)
+    if not urls:
+        return {}
+    result: Dict[str, List[ImageVariant]] = {}
+    rows = (
+        db.query(ImageVariant)
+        .filter(ImageVariant.source_url.in_(urls))
+        .order_by(ImageVariant.width)
+        .all()
+    )
+    for row in rows:
+        result.setdefault(row.source_url, []).append(row)
+    return result
+
+
+def variants_version(article_id):
+    """
+    Count and highest id of the variants recorded for the uploads an article
+    references, as scalar subqueries for the article's ETag validator.
+    Variants are recorded after the article is saved, so its ETag has to
+    change when they appear. ``article_id`` may be a value or a column.
+    """
+    def aggregate(column):
+        return (
+            select(column)
+            .select_from(ImageVariant)
+            .join(UploadReference, UploadReference.url == ImageVariant.source_url)
+            .where(UploadReference.article_id == article_id)
+            .scalar_subquery()
+        )
+    return aggregate(func.count(ImageVariant.id)), aggregate(func.max(ImageVariant.id))
@@ -0,0 +1,96 @@
+"""
+Closed-loop HTTP load test for the read endpoints.
+
+Runs ``--concurrency`` clients against a running server for ``--duration``
+seconds, each issuing requests back to back, and prints requests per second
+and latency percentiles per endpoint. Start the server with a fixed worker
+count so runs are comparable, e.g.
+
+    uvicorn backend.main:app --workers 1 --port 8000
+    python -m backend.loadtest --base-url http://127.0.0.1:8000 --concurrency 64
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+
+def build_paths(client: httpx.Client) -> List[str]:
+    """A request mix of listings, single articles (by id and slug) and categories."""
+    articles = client.get("/api/articles/index", params={"limit": 200}).json()
+    paths = ["/api/categories", "/api/articles?limit=20", "/api/articles/index?limit=50"]
+    for article in articles[:50]:
+        paths.append(f"/api/articles/{article['id']}")
+        paths.append(f"/api/articles/slug/{article['slug']}")
+    return paths
+
+
+def endpoint_name(path: str) -> str:
+    if path.startswith("/api/articles/slug/"):
+        return "/api/articles/slug/{slug}"
+    tail = path.split("?")[0].rsplit("/", 1)[-1]
+    if path.startswith("/api/articles/") and tail.isdigit():
+        return "/api/articles/{id}"
+    return path.split("?")[0]
+
+
+async def worker(client: httpx.AsyncClient, paths: List[str], deadline: float,
+                 latencies: Dict[str, List[float]], errors: Dict[str, int], seed: int):
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        path = rng.choice(paths)
+        began = time.perf_counter()
+        try:
+            response = await client.get(path)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        name = endpoint_name(path)
+        if ok:
+            latencies[name].append(time.perf_counter() - began)
+        else:
+            errors[name] += 1
+
+
+async def run(base_url: str, concurrency: int, duration: float):
+    with httpx.Client(base_url=base_url) as client:
+        paths = build_paths(client)
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            worker(client, paths, deadline, latencies, errors, seed)
+            for seed in range(concurrency)
+        ))
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"{'endpoint':32} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name in sorted(set(latencies) | set(errors)):
+        values = sorted(latencies[name])
+        if values:
+            p50 = values[len(values) // 2] * 1000
+            p99 = values[min(len(values) - 1, int(len(values) * 0.99))] * 1000
+        else:
+            p50 = p99 = 0.0
+        print(f"{name:32} {len(values) / duration:9.1f} {p50:8.1f} {p99:8.1f} {errors[name]:7}")
+    print(f"{'total':32} {total / duration:9.1f} {'':8} {'':8} {sum(errors.values()):7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the read endpoints")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.concurrency, args.duration))
+
+
+if __name__ == "__main__":
+    main()
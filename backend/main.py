@@ -1,14 +1,23 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, Header, Request, Response, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from typing import List
-from sqlalchemy import create_engine, or_, func
-from sqlalchemy.orm import sessionmaker, Session
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Iterator, List, Optional
+from sqlalchemy import create_engine, delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker, joinedload
 import os
+import threading
 import uuid
+from datetime import datetime
 from pathlib import Path
-from backend.models import Base, Article, Category, Feedback
+from backend.models import Article, Category, Feedback, UploadReference
 from backend.settings import get_settings
+from backend.database import engine_options, sync_database_url
+from backend.pool_metrics import PoolMetrics
+from backend.replicas import ReplicaRouter
 from backend.schemas import (
     SearchRequest,
     SearchResult,
@@ -19,508 +28,747 @@ from backend.schemas import (
     ArticleCreate,
     ArticleUpdate,
     ArticleResponse,
-    ContentBlock,
+    ArticleSummary,
+    BulkImportResult,
     FeedbackCreate,
     FeedbackResponse,
     FeedbackUpdate,
+    MultipartUploadInit,
+    MultipartUploadPart,
+    MultipartUploadStatus,
+    MultipartUploadComplete,
 )
-from backend.email_utils import send_feedback_confirmation_email, send_feedback_response_email
+from backend.outbox import OutboxWorker, enqueue_email
+from backend.email_utils import close_smtp_pool
+from backend.uploads import (
+    UPLOAD_DIR,
+    ALLOWED_EXTENSIONS,
+    UploadTooLarge,
+    FormFileStream,
+    MalformedUpload,
+    MultipartUploadError,
+    MultipartUploadStore,
+    ImmutableStaticFiles,
+    ensure_upload_dirs,
+    find_by_hash,
+    backfill_upload_references,
+    referencing_articles,
+    stream_to_store,
+    sync_upload_references,
+)
+from backend.images import ImageDerivativeWorker, variants_for, variants_version
+from backend.article_io import ArticleImporter, export_ndjson, iter_ndjson_lines
+from backend.media import MediaFiles
+from backend.search import create_search_backend, content_snippet
+from backend.suggest import SuggestIndex
+from backend.cache import VersionedCache
+from backend.view_counter import ViewCounter
+from backend.http_cache import make_etag, etag_matches, set_cache_headers, not_modified
+from backend.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, seek_after
+from backend.queries import (
+    ARTICLE_SORT,
+    FEEDBACK_SORT,
+    article_index_query,
+    article_list_query,
+    article_stats_query,
+    category_counts_query,
+    feedback_list_query,
+)
+from backend.serialization import ArticleMapper, article_summary_dict
+
+
+def article_image_variants(db: Session, article: Article):
+    """Map each image URL in the article's content to its recorded variants."""
+    image_urls = {
+        url for block in article.content or []
+        for url in block.get("images") or []
+    }
+    variants = variants_for(db, image_urls)
+    return {
+        url: [{"url": v.url, "width": v.width, "format": v.format} for v in rows]
+        for url, rows in variants.items()
+    }
 
 
 def compute_relevance(query: str, article: Article) -> str:
     q = query.lower()
     title = (article.title or "").lower()
     excerpt = (article.excerpt or "").lower()
-    content = (article.content or "").lower()
 
     if q in title:
         return "high"
     if q in excerpt:
         return "medium"
-    if q in content:
-        return "low"
     return "low"
 
 
 settings = get_settings()
-# Use pymysql driver for MySQL for easier local setup
-_db_url = settings.database_url
-if _db_url.startswith("mysql://") and "+pymysql" not in _db_url:
-    _db_url = _db_url.replace("mysql://", "mysql+pymysql://")
-engine = create_engine(_db_url, pool_pre_ping=True)
+# Background workers and scripts use their own, smaller pool
+engine = create_engine(
+    sync_database_url(settings.database_url),
+    **engine_options(settings, settings.db_worker_pool_size))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Create tables if not exist
-Base.metadata.create_all(bind=engine)
+# Request handlers are sync and run in Starlette's threadpool (see
+# backend/loadtest.py); objects stay loaded after commit so building a
+# response never reloads them
+request_engine = create_engine(
+    sync_database_url(settings.database_url),
+    **engine_options(settings, settings.db_pool_size))
+RequestSessionLocal = sessionmaker(
+    request_engine, autoflush=False, expire_on_commit=False)
+# Read-only handlers go to the replicas when configured (see backend/replicas.py)
+replica_router = ReplicaRouter(
+    request_engine,
+    [
+        create_engine(
+            sync_database_url(url),
+            **engine_options(settings, settings.db_pool_size, url=url))
+        for url in settings.database_replicas
+    ],
+    check_interval=settings.replica_check_interval,
+    sticky_seconds=settings.read_your_writes_seconds,
+)
+# Checkout waits, in-use and overflow counts for GET /api/metrics/pool
+pool_metrics = {
+    "requests": PoolMetrics(request_engine),
+    "workers": PoolMetrics(engine),
+    **{
+        replica.name: PoolMetrics(replica.engine)
+        for replica in replica_router.replicas
+    },
+}
+
+# The schema is owned by the migrations: run
+# ``alembic -c backend/alembic.ini upgrade head`` before starting the app.
 
 # Create uploads directory
-UPLOAD_DIR = Path("backend/uploads")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-(UPLOAD_DIR / "images").mkdir(exist_ok=True)
-(UPLOAD_DIR / "videos").mkdir(exist_ok=True)
+ensure_upload_dirs()
+multipart_uploads = MultipartUploadStore(
+    max_part_size=settings.max_upload_part_size)
+# Set once upload_references is known to be complete; file deletes are
+# refused until then rather than trusting an empty table
+upload_references_ready = threading.Event()
+# Responsive image variants, generated off the request path
+image_worker = ImageDerivativeWorker(
+    SessionLocal, UPLOAD_DIR, workers=settings.image_workers)
+
+# Article search backend (see backend/search.py)
+search_backend = create_search_backend(
+    settings.search_backend, engine, refresh_interval=settings.search_refresh_interval)
+# Background email delivery (see backend/outbox.py)
+outbox_worker = OutboxWorker(
+    SessionLocal,
+    workers=settings.email_workers,
+    poll_interval=settings.email_poll_interval,
+    max_attempts=settings.email_max_attempts,
+    backoff_base=settings.email_retry_backoff,
+)
+# Type-ahead prefix index (see backend/suggest.py)
+suggest_index = SuggestIndex(engine, refresh_interval=settings.search_refresh_interval)
+# GET /api/categories response, invalidated by category and article writes
+categories_cache = VersionedCache(ttl=settings.categories_cache_ttl)
+# Article response payloads, with validated content cached per revision
+article_mapper = ArticleMapper()
+# Buffered article view counts (see backend/view_counter.py)
+view_counter = ViewCounter(
+    engine,
+    flush_interval=settings.view_count_flush_interval,
+    flush_threshold=settings.view_count_flush_threshold,
+)
+
 
-app = FastAPI(title="Albedo Support API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    with SessionLocal() as db:
+        search_backend.rebuild(db)
+        suggest_index.rebuild(db)
+        try:
+            added = backfill_upload_references(db)
+            if added:
+                print(f"[UPLOADS] Backfilled {added} upload reference(s)")
+        except IntegrityError:
+            # Another worker backfilled the table at the same time
+            db.rollback()
+    upload_references_ready.set()
+    view_counter.start()
+    outbox_worker.start()
+    image_worker.start()
+    replica_router.start()
+    yield
+    await replica_router.stop()
+    image_worker.stop()
+    outbox_worker.stop()
+    close_smtp_pool()
+    view_counter.stop()
+    request_engine.dispose()
+
+
+app = FastAPI(
+    title="Albedo Support API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
-# Mount static files for serving uploads
-app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
+# Mount static files for serving uploads. Videos get their own mount (it must
+# come first) so seeking players are served byte ranges efficiently.
+media_files = MediaFiles(UPLOAD_DIR / "videos")
+app.mount("/uploads/videos", media_files, name="videos")
+app.mount("/uploads", ImmutableStaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
 
-# CORS
+# CORS. The admin and support pages send credentials (the read_primary_until
+# cookie), and browsers reject a credentialed response with "Access-Control-
+# Allow-Origin: *", so a wildcard origin is matched as a regex instead, which
+# echoes the caller's origin back.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins,
+    allow_origins=[origin for origin in settings.cors_origins if origin != "*"],
+    allow_origin_regex=".*" if "*" in settings.cors_origins else None,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
-def get_db() -> Session:
-    db = SessionLocal()
-    try:
+def get_db(request: Request, response: Response) -> Iterator[Session]:
+    """Session on the primary. Writes keep the client's reads on it for a while."""
+    if request.method not in ("GET", "HEAD", "OPTIONS"):
+        replica_router.stick_to_primary(response)
+    with RequestSessionLocal() as db:
+        yield db
+
+
+def get_read_db(request: Request) -> Iterator[Session]:
+    """Session on a healthy replica (or the primary) for read-only handlers."""
+    with RequestSessionLocal(bind=replica_router.engine_for_read(request)) as db:
         yield db
-    finally:
-        db.close()
+
+
+def rebuild_suggestions() -> None:
+    """
+    Rebuild the type-ahead index after a bulk import (single writes update
+    it in place); CPU bound, so callers run it in the threadpool.
+    """
+    with SessionLocal() as db:
+        suggest_index.rebuild(db)
 
 
 @app.post("/api/search/articles", response_model=List[SearchResult])
-def search_articles(payload: SearchRequest):
+def search_articles(payload: SearchRequest, db: Session = Depends(get_read_db)):
     query = payload.query.strip()
     if not query:
         raise HTTPException(status_code=400, detail="Query must not be empty")
 
-    with SessionLocal() as db:
-        like = f"%{query}%"
-        results = (
-            db.query(Article)
-            .join(Category, Article.category_id == Category.id)
-            .filter(
-                or_(
-                    Article.title.ilike(like),
-                    Article.excerpt.ilike(like),
-                    Article.content.ilike(like),
-                )
+    limit = max(1, min(25, payload.limit))
+    article_ids = search_backend.search(db, query, limit)
+    if not article_ids:
+        return []
+
+    # Hydrate only the hits, then restore the backend's ranking
+    rows = db.scalars(
+        select(Article)
+        .options(joinedload(Article.category))
+        .where(Article.id.in_(article_ids))
+    )
+    by_id = {a.id: a for a in rows}
+    results = [by_id[i] for i in article_ids if i in by_id]
+
+    formatted: List[SearchResult] = []
+    for a in results:
+        relevance = compute_relevance(query, a)
+        formatted.append(
+            SearchResult(
+                id=a.id,
+                title=a.title,
+                excerpt=a.excerpt or content_snippet(a.content),
+                slug=a.slug,
+                url=a.url,
+                category=SearchResultCategory(
+                    name=a.category.name, color=a.category.color),
+                relevance=relevance,
             )
-            .order_by(func.length(Article.title))
-            .limit(max(1, min(25, payload.limit)))
-            .all()
         )
 
-        formatted: List[SearchResult] = []
-        for a in results:
-            relevance = compute_relevance(query, a)
-            formatted.append(
-                SearchResult(
-                    id=a.id,
-                    title=a.title,
-                    excerpt=a.excerpt or (
-                        a.content[:160] if a.content else ""),
-                    slug=a.slug,
-                    url=a.url,
-                    category=SearchResultCategory(
-                        name=a.category.name, color=a.category.color),
-                    relevance=relevance,
-                )
-            )
+    return formatted
 
-        return formatted
+
+@app.get("/api/search/suggest", response_model=List[SearchResult])
+def search_suggest(q: str, limit: int = 5):
+    """Type-ahead suggestions by title, slug or category name prefix."""
+    return suggest_index.suggest(q, max(1, min(25, limit)))
 
 
 @app.get("/api/categories", response_model=List[CategoryWithCount])
-def get_categories():
-    with SessionLocal() as db:
-        categories = db.query(Category).all()
-        result = []
-        for cat in categories:
-            article_count = db.query(func.count(Article.id)).filter(
-                Article.category_id == cat.id
-            ).scalar()
-            result.append(
-                CategoryWithCount(
-                    id=cat.id,
-                    name=cat.name,
-                    description=cat.description,
-                    color=cat.color,
-                    article_count=article_count or 0,
-                    created_at=cat.created_at,
-                    updated_at=cat.updated_at,
-                )
+def get_categories(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    # The primary, not a replica: a lagging replica would refill the cache
+    # with the pre-write state right after a write invalidated it
+    db: Session = Depends(get_db),
+):
+    cached = categories_cache.get()
+    if cached is None:
+        version = categories_cache.version
+        cached = load_categories(db)
+        categories_cache.set(cached, version=version)
+
+    etag, result = cached
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, settings.http_cache_control)
+    set_cache_headers(response, etag, settings.http_cache_control)
+    return result
+
+
+def load_categories(db: Session):
+    """Load categories with article counts. Returns (etag, categories)."""
+    rows = db.execute(category_counts_query())
+    result = []
+    for cat, article_count in rows:
+        result.append(
+            CategoryWithCount(
+                id=cat.id,
+                name=cat.name,
+                description=cat.description,
+                color=cat.color,
+                article_count=article_count or 0,
+                created_at=cat.created_at,
+                updated_at=cat.updated_at,
             )
-        return result
+        )
+
+    etag = make_etag([c.model_dump() for c in result])
+    return etag, result
 
 
 @app.post("/api/categories", response_model=CategoryResponse, status_code=201)
-def create_category(payload: CategoryCreate):
-    with SessionLocal() as db:
-        # Check if category with same name already exists
-        existing = db.query(Category).filter(
-            Category.name == payload.name).first()
-        if existing:
-            raise HTTPException(
-                status_code=400, detail="Category with this name already exists")
+def create_category(payload: CategoryCreate, db: Session = Depends(get_db)):
+    # Check if category with same name already exists
+    existing = db.scalar(
+        select(Category).where(Category.name == payload.name))
+    if existing:
+        raise HTTPException(
+            status_code=400, detail="Category with this name already exists")
 
-        # Create new category
-        new_category = Category(
-            name=payload.name,
-            description=payload.description,
-            color=payload.color
-        )
-        db.add(new_category)
-        db.commit()
-        db.refresh(new_category)
+    # Create new category
+    new_category = Category(
+        name=payload.name,
+        description=payload.description,
+        color=payload.color
+    )
+    db.add(new_category)
+    db.commit()
+    db.refresh(new_category)
+    categories_cache.invalidate()
 
-        return new_category
+    return new_category
 
 
 @app.put("/api/categories/{category_id}", response_model=CategoryResponse)
-def update_category(category_id: int, payload: CategoryCreate):
-    with SessionLocal() as db:
-        # Find the category
-        category = db.query(Category).filter(
-            Category.id == category_id).first()
-        if not category:
-            raise HTTPException(status_code=404, detail="Category not found")
-
-        # Check if new name conflicts with another category
-        if payload.name != category.name:
-            existing = db.query(Category).filter(
+def update_category(category_id: int, payload: CategoryCreate, db: Session = Depends(get_db)):
+    # Find the category
+    category = db.get(Category, category_id)
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+
+    # Check if new name conflicts with another category
+    if payload.name != category.name:
+        existing = db.scalar(
+            select(Category).where(
                 Category.name == payload.name,
                 Category.id != category_id
-            ).first()
-            if existing:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Category with this name already exists"
-                )
+            )
+        )
+        if existing:
+            raise HTTPException(
+                status_code=400,
+                detail="Category with this name already exists"
+            )
 
-        # Update the category
-        category.name = payload.name
-        category.description = payload.description
-        if payload.color is not None:
-            category.color = payload.color
+    # Update the category
+    category.name = payload.name
+    category.description = payload.description
+    if payload.color is not None:
+        category.color = payload.color
 
-        db.commit()
-        db.refresh(category)
+    db.commit()
+    db.refresh(category)
+    categories_cache.invalidate()
+    suggest_index.update_category(category)
 
-        return category
+    return category
 
 
 @app.delete("/api/categories/{category_id}", status_code=204)
-def delete_category(category_id: int):
-    with SessionLocal() as db:
-        # Find the category
-        category = db.query(Category).filter(
-            Category.id == category_id).first()
-        if not category:
-            raise HTTPException(status_code=404, detail="Category not found")
-
-        # Check if category has articles
-        article_count = db.query(func.count(Article.id)).filter(
+def delete_category(category_id: int, db: Session = Depends(get_db)):
+    # Find the category
+    category = db.get(Category, category_id)
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+
+    # Check if category has articles
+    article_count = db.scalar(
+        select(func.count(Article.id)).where(
             Article.category_id == category_id
-        ).scalar()
+        )
+    )
 
-        if article_count and article_count > 0:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Cannot delete category with {article_count} article(s). Please reassign or delete the articles first."
-            )
+    if article_count and article_count > 0:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot delete category with {article_count} article(s). Please reassign or delete the articles first."
+        )
 
-        # Delete the category
-        db.delete(category)
-        db.commit()
+    # Delete the category
+    db.delete(category)
+    db.commit()
+    categories_cache.invalidate()
 
-        return None
+    return None
 
 
 # ============ Articles CRUD ============
 
+def article_list_etag(db: Session, *params) -> str:
+    """
+    ETag for a filtered article listing, computed from one aggregate query
+    (row count, newest edit, total views, newest category edit) so a match
+    can be answered without loading any article.
+    """
+    query = article_stats_query(*params[1:4])
+    return make_etag(*params, *db.execute(query).one())
+
+
 @app.get("/api/articles", response_model=List[ArticleResponse])
 def get_articles(
     category_id: int = None,
     is_published: bool = None,
     is_featured: bool = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
 ):
-    """Get all articles with optional filtering."""
-    with SessionLocal() as db:
-        query = db.query(Article).join(Category)
-
-        # Apply filters
-        if category_id is not None:
-            query = query.filter(Article.category_id == category_id)
-        if is_published is not None:
-            query = query.filter(Article.is_published == is_published)
-        if is_featured is not None:
-            query = query.filter(Article.is_featured == is_featured)
-
-        # Order by order field, then by created_at
-        articles = query.order_by(Article.order, Article.created_at.desc()).offset(
-            skip).limit(limit).all()
-
-        # Transform to response format
-        result = []
-        for article in articles:
-            # Convert content from dict to ContentBlock objects
-            content_blocks = [ContentBlock(
-                **block) for block in article.content] if article.content else None
-
-            result.append(
-                ArticleResponse(
-                    id=article.id,
-                    title=article.title,
-                    slug=article.slug,
-                    excerpt=article.excerpt,
-                    content=content_blocks,
-                    url=article.url,
-                    is_published=bool(article.is_published),
-                    is_featured=bool(article.is_featured),
-                    view_count=article.view_count,
-                    order=article.order,
-                    created_at=article.created_at,
-                    updated_at=article.updated_at,
-                    category_id=article.category_id,
-                    category=SearchResultCategory(
-                        name=article.category.name,
-                        color=article.category.color
-                    )
-                )
-            )
-        return result
+    """
+    Get all articles with optional filtering.
+    Pages are fetched with ``cursor`` (from the previous page's X-Next-Cursor
+    header) rather than ``skip``, which gets slower the deeper it goes.
+    """
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="Use either cursor or skip")
+    etag = article_list_etag(
+        db, "articles", category_id, is_published, is_featured, skip, limit, cursor)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, settings.http_cache_control)
+
+    # Order by order field, then newest first
+    query = article_list_query(category_id, is_published, is_featured)
+    if cursor:
+        query = query.where(seek_after(
+            ARTICLE_SORT, decode_cursor(cursor, (int, datetime, int))))
+
+    # One extra row tells whether there is a next page
+    articles = db.scalars(query.offset(skip).limit(limit + 1)).all()
+
+    # Serialize rows directly; see backend/serialization.py
+    result = ORJSONResponse(article_mapper.to_dicts(articles[:limit]))
+    set_cache_headers(result, etag, settings.http_cache_control)
+    if limit > 0 and len(articles) > limit:
+        last = articles[limit - 1]
+        result.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            (last.order, last.created_at, last.id))
+    return result
+
+
+@app.get("/api/articles/index", response_model=List[ArticleSummary])
+def get_article_index(
+    category_id: int = None,
+    is_published: bool = None,
+    is_featured: bool = None,
+    skip: int = 0,
+    limit: int = 100,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Lightweight article listing for navigation.
+    Only the columns needed to render links are selected; content is never loaded.
+    """
+    etag = article_list_etag(
+        db, "index", category_id, is_published, is_featured, skip, limit)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, settings.http_cache_control)
+
+    query = article_index_query(category_id, is_published, is_featured)
+    articles = db.scalars(query.offset(skip).limit(limit))
+
+    result = ORJSONResponse([article_summary_dict(article) for article in articles])
+    set_cache_headers(result, etag, settings.http_cache_control)
+    return result
+
+
+@app.post("/api/articles/bulk", response_model=BulkImportResult)
+async def bulk_import_articles(request: Request, response: Response, batch_size: int = 500):
+    """
+    Import articles from an NDJSON request body (one ArticleCreate object per
+    line). Valid rows are inserted in batches; invalid or conflicting lines
+    are skipped and reported with their line number.
+    """
+    importer = ArticleImporter(
+        RequestSessionLocal,
+        batch_size=max(1, min(batch_size, 5000)),
+        on_inserted=search_backend.index_article,
+    )
+    async for line_number, line in iter_ndjson_lines(request.stream()):
+        if importer.add(line_number, line):
+            await run_in_threadpool(importer.flush)
+    await run_in_threadpool(importer.flush)
+
+    if importer.inserted:
+        categories_cache.invalidate()
+        await run_in_threadpool(rebuild_suggestions)
+
+    replica_router.stick_to_primary(response)
+    errors = sorted(importer.errors, key=lambda e: e["line"])
+    return BulkImportResult(inserted=importer.inserted, errors=errors)
+
+
+@app.get("/api/articles/export")
+def export_articles(request: Request, category_id: int = None, is_published: bool = None):
+    """Stream all (or the filtered) articles as NDJSON, in id order."""
+    read_engine = replica_router.engine_for_read(request)
+    return StreamingResponse(
+        export_ndjson(
+            partial(RequestSessionLocal, bind=read_engine), category_id, is_published),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="articles.ndjson"'},
+    )
 
 
 @app.get("/api/articles/{article_id}", response_model=ArticleResponse)
-def get_article(article_id: int):
+def get_article(
+    article_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+):
     """Get a single article by ID."""
-    with SessionLocal() as db:
-        article = db.query(Article).filter(Article.id == article_id).first()
-        if not article:
-            raise HTTPException(status_code=404, detail="Article not found")
-
-        # Convert content from dict to ContentBlock objects
-        content_blocks = [ContentBlock(
-            **block) for block in article.content] if article.content else None
-
-        return ArticleResponse(
-            id=article.id,
-            title=article.title,
-            slug=article.slug,
-            excerpt=article.excerpt,
-            content=content_blocks,
-            url=article.url,
-            is_published=bool(article.is_published),
-            is_featured=bool(article.is_featured),
-            view_count=article.view_count,
-            order=article.order,
-            created_at=article.created_at,
-            updated_at=article.updated_at,
-            category_id=article.category_id,
-            category=SearchResultCategory(
-                name=article.category.name,
-                color=article.category.color
-            )
-        )
+    # Check the validator columns first so a 304 skips loading content
+    validator = db.execute(
+        select(Article.updated_at, Article.view_count, Category.updated_at,
+               *variants_version(article_id))
+        .join(Category, Article.category_id == Category.id)
+        .where(Article.id == article_id)
+    ).first()
+    if not validator:
+        raise HTTPException(status_code=404, detail="Article not found")
+    etag = make_etag("article", article_id, *validator)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, settings.http_cache_control)
+
+    article = db.scalar(
+        select(Article)
+        .options(joinedload(Article.category))
+        .where(Article.id == article_id)
+    )
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    result = ORJSONResponse(article_mapper.to_dict(
+        article, image_variants=article_image_variants(db, article)))
+    set_cache_headers(result, etag, settings.http_cache_control)
+    return result
 
 
 @app.get("/api/articles/slug/{slug}", response_model=ArticleResponse)
-def get_article_by_slug(slug: str):
+def get_article_by_slug(
+    slug: str,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+):
     """Get a single article by slug."""
-    with SessionLocal() as db:
-        article = db.query(Article).filter(Article.slug == slug).first()
-        if not article:
-            raise HTTPException(status_code=404, detail="Article not found")
-
-        # Increment view count
-        article.view_count += 1
-        db.commit()
-
-        # Convert content from dict to ContentBlock objects
-        content_blocks = [ContentBlock(
-            **block) for block in article.content] if article.content else None
-
-        return ArticleResponse(
-            id=article.id,
-            title=article.title,
-            slug=article.slug,
-            excerpt=article.excerpt,
-            content=content_blocks,
-            url=article.url,
-            is_published=bool(article.is_published),
-            is_featured=bool(article.is_featured),
-            view_count=article.view_count,
-            order=article.order,
-            created_at=article.created_at,
-            updated_at=article.updated_at,
-            category_id=article.category_id,
-            category=SearchResultCategory(
-                name=article.category.name,
-                color=article.category.color
-            )
-        )
+    # The ETag is weak: it ignores view_count, which changes on every read
+    validator = db.execute(
+        select(Article.id, Article.updated_at, Category.updated_at,
+               *variants_version(Article.id))
+        .join(Category, Article.category_id == Category.id)
+        .where(Article.slug == slug)
+    ).first()
+    if not validator:
+        raise HTTPException(status_code=404, detail="Article not found")
+
+    # Record the view; it is written to the database in batches
+    view_counter.record(validator.id)
+
+    etag = make_etag("article", *validator, weak=True)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, settings.http_cache_control)
+
+    article = db.scalar(
+        select(Article)
+        .options(joinedload(Article.category))
+        .where(Article.slug == slug)
+    )
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    view_count = article.view_count + view_counter.pending(article.id)
+    result = ORJSONResponse(article_mapper.to_dict(
+        article,
+        view_count=view_count,
+        image_variants=article_image_variants(db, article),
+    ))
+    set_cache_headers(result, etag, settings.http_cache_control)
+    return result
 
 
 @app.post("/api/articles", response_model=ArticleResponse, status_code=201)
-def create_article(payload: ArticleCreate):
+def create_article(payload: ArticleCreate, db: Session = Depends(get_db)):
     """Create a new article."""
-    with SessionLocal() as db:
-        # Check if category exists
-        category = db.query(Category).filter(
-            Category.id == payload.category_id).first()
-        if not category:
-            raise HTTPException(status_code=400, detail="Category not found")
-
-        # Check if slug already exists
-        existing = db.query(Article).filter(
-            Article.slug == payload.slug).first()
-        if existing:
-            raise HTTPException(
-                status_code=400, detail="Article with this slug already exists")
-
-        # Create new article
-        # Convert content blocks to dict for JSON storage
-        content_data = [block.model_dump()
-                        for block in payload.content] if payload.content else None
-
-        new_article = Article(
-            title=payload.title,
-            slug=payload.slug,
-            excerpt=payload.excerpt,
-            content=content_data,
-            url=payload.url,
-            is_published=payload.is_published,
-            is_featured=payload.is_featured,
-            view_count=payload.view_count,
-            order=payload.order,
-            category_id=payload.category_id
-        )
-        db.add(new_article)
-        db.commit()
-        db.refresh(new_article)
-
-        # Convert content back to ContentBlock objects for response
-        content_blocks = [ContentBlock(
-            **block) for block in new_article.content] if new_article.content else None
-
-        return ArticleResponse(
-            id=new_article.id,
-            title=new_article.title,
-            slug=new_article.slug,
-            excerpt=new_article.excerpt,
-            content=content_blocks,
-            url=new_article.url,
-            is_published=bool(new_article.is_published),
-            is_featured=bool(new_article.is_featured),
-            view_count=new_article.view_count,
-            order=new_article.order,
-            created_at=new_article.created_at,
-            updated_at=new_article.updated_at,
-            category_id=new_article.category_id,
-            category=SearchResultCategory(
-                name=category.name,
-                color=category.color
-            )
-        )
+    # Check if category exists
+    category = db.get(Category, payload.category_id)
+    if not category:
+        raise HTTPException(status_code=400, detail="Category not found")
+
+    # Check if slug already exists
+    existing = db.scalar(
+        select(Article.id).where(Article.slug == payload.slug))
+    if existing:
+        raise HTTPException(
+            status_code=400, detail="Article with this slug already exists")
+
+    # Create new article
+    # Convert content blocks to dict for JSON storage
+    content_data = [block.model_dump()
+                    for block in payload.content] if payload.content else None
+
+    new_article = Article(
+        title=payload.title,
+        slug=payload.slug,
+        excerpt=payload.excerpt,
+        content=content_data,
+        url=payload.url,
+        is_published=payload.is_published,
+        is_featured=payload.is_featured,
+        view_count=payload.view_count,
+        order=payload.order,
+        category_id=payload.category_id
+    )
+    db.add(new_article)
+    db.flush()
+    sync_upload_references(db, new_article)
+    db.commit()
+    db.refresh(new_article)
+    search_backend.index_article(new_article)
+    categories_cache.invalidate()
+    suggest_index.upsert(new_article, category)
+
+    return article_mapper.to_dict(new_article, category=category)
 
 
 @app.put("/api/articles/{article_id}", response_model=ArticleResponse)
-def update_article(article_id: int, payload: ArticleUpdate):
+def update_article(article_id: int, payload: ArticleUpdate, db: Session = Depends(get_db)):
     """Update an existing article."""
-    with SessionLocal() as db:
-        article = db.query(Article).filter(Article.id == article_id).first()
-        if not article:
-            raise HTTPException(status_code=404, detail="Article not found")
-
-        # Check if new slug conflicts with another article
-        if payload.slug and payload.slug != article.slug:
-            existing = db.query(Article).filter(
+    article = db.get(
+        Article, article_id, options=[joinedload(Article.category)])
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+
+    # Check if new slug conflicts with another article
+    if payload.slug and payload.slug != article.slug:
+        existing = db.scalar(
+            select(Article.id).where(
                 Article.slug == payload.slug,
                 Article.id != article_id
-            ).first()
-            if existing:
-                raise HTTPException(
-                    status_code=400, detail="Article with this slug already exists")
-
-        # Check if category exists if being updated
-        if payload.category_id and payload.category_id != article.category_id:
-            category = db.query(Category).filter(
-                Category.id == payload.category_id).first()
-            if not category:
-                raise HTTPException(
-                    status_code=400, detail="Category not found")
-
-        # Update fields - using model_dump to check what was actually sent
-        update_data = payload.model_dump(exclude_unset=True)
-
-        if "title" in update_data:
-            article.title = payload.title
-        if "slug" in update_data:
-            article.slug = payload.slug
-        if "excerpt" in update_data:
-            article.excerpt = payload.excerpt
-        if "content" in update_data:
-            # Convert content blocks to dict for JSON storage
-            article.content = [
-                block.model_dump() for block in payload.content] if payload.content else None
-        if "url" in update_data:
-            article.url = payload.url
-        if payload.is_published is not None:
-            article.is_published = payload.is_published
-        if payload.is_featured is not None:
-            article.is_featured = payload.is_featured
-        if payload.view_count is not None:
-            article.view_count = payload.view_count
-        if payload.order is not None:
-            article.order = payload.order
-        if payload.category_id is not None:
-            article.category_id = payload.category_id
-
-        db.commit()
-        db.refresh(article)
-
-        # Convert content from dict to ContentBlock objects
-        content_blocks = [ContentBlock(
-            **block) for block in article.content] if article.content else None
-
-        return ArticleResponse(
-            id=article.id,
-            title=article.title,
-            slug=article.slug,
-            excerpt=article.excerpt,
-            content=content_blocks,
-            url=article.url,
-            is_published=bool(article.is_published),
-            is_featured=bool(article.is_featured),
-            view_count=article.view_count,
-            order=article.order,
-            created_at=article.created_at,
-            updated_at=article.updated_at,
-            category_id=article.category_id,
-            category=SearchResultCategory(
-                name=article.category.name,
-                color=article.category.color
             )
         )
+        if existing:
+            raise HTTPException(
+                status_code=400, detail="Article with this slug already exists")
+
+    # Check if category exists if being updated
+    if payload.category_id and payload.category_id != article.category_id:
+        category = db.get(Category, payload.category_id)
+        if not category:
+            raise HTTPException(
+                status_code=400, detail="Category not found")
+
+    # Update fields - using model_dump to check what was actually sent
+    update_data = payload.model_dump(exclude_unset=True)
+
+    if "title" in update_data:
+        article.title = payload.title
+    if "slug" in update_data:
+        article.slug = payload.slug
+    if "excerpt" in update_data:
+        article.excerpt = payload.excerpt
+    if "content" in update_data:
+        # Convert content blocks to dict for JSON storage
+        article.content = [
+            block.model_dump() for block in payload.content] if payload.content else None
+        sync_upload_references(db, article)
+    if "url" in update_data:
+        article.url = payload.url
+    if payload.is_published is not None:
+        article.is_published = payload.is_published
+    if payload.is_featured is not None:
+        article.is_featured = payload.is_featured
+    if payload.view_count is not None:
+        article.view_count = payload.view_count
+    if payload.order is not None:
+        article.order = payload.order
+    if payload.category_id is not None:
+        article.category_id = payload.category_id
+
+    db.commit()
+    db.refresh(article)
+    article_mapper.invalidate(article_id)
+    # Already in the identity map: loaded with the article or validated above
+    category = db.get(Category, article.category_id)
+    search_backend.index_article(article)
+    categories_cache.invalidate()
+    suggest_index.upsert(article, category)
+
+    return article_mapper.to_dict(article, category=category)
 
 
 @app.delete("/api/articles/{article_id}", status_code=204)
-def delete_article(article_id: int):
+def delete_article(article_id: int, db: Session = Depends(get_db)):
     """Delete an article."""
-    with SessionLocal() as db:
-        article = db.query(Article).filter(Article.id == article_id).first()
-        if not article:
-            raise HTTPException(status_code=404, detail="Article not found")
+    article = db.get(Article, article_id)
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
 
-        db.delete(article)
-        db.commit()
+    db.execute(
+        delete(UploadReference).where(UploadReference.article_id == article_id))
+    db.delete(article)
+    db.commit()
+    article_mapper.invalidate(article_id)
+    search_backend.remove_article(article_id)
+    categories_cache.invalidate()
+    suggest_index.remove(article_id)
 
-        return None
+    return None
 
 
 # ============ File Upload ============
 
-@app.post("/api/upload")
-async def upload_file(file: UploadFile = File(...), file_type: str = "image"):
+# Slack for the multipart envelope (boundaries, part headers) when checking
+# Content-Length against the file size limit
+MULTIPART_OVERHEAD = 16 * 1024
+
+
+@app.post("/api/upload", openapi_extra={"requestBody": {
+    "required": True,
+    "content": {"multipart/form-data": {"schema": {
+        "type": "object",
+        "required": ["file"],
+        "properties": {"file": {"type": "string", "format": "binary"}},
+    }}},
+}})
+async def upload_file(request: Request, file_type: str = "image"):
     """
-    Upload a file (image or video).
+    Upload a file (image or video) as the ``file`` field of a multipart form.
+    The body is parsed as it streams in, so an oversized file is rejected
+    mid-body and never spooled to disk first.
     Returns the URL path to access the uploaded file.
     """
     # Validate file type
@@ -528,12 +776,23 @@ async def upload_file(file: UploadFile = File(...), file_type: str = "image"):
         raise HTTPException(
             status_code=400, detail="file_type must be 'image' or 'video'")
 
+    max_size = (settings.max_image_upload_size if file_type == "image"
+                else settings.max_video_upload_size)
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_size + MULTIPART_OVERHEAD:
+        raise HTTPException(status_code=413, detail=str(UploadTooLarge(max_size)))
+
+    try:
+        form = FormFileStream(request.stream(), request.headers.get("content-type", ""))
+        filename = await form.open()
+    except MalformedUpload as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     # Validate file extension
-    allowed_image_extensions = {
-        ".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg"}
-    allowed_video_extensions = {".mp4", ".webm", ".ogg", ".mov", ".avi"}
+    allowed_image_extensions = ALLOWED_EXTENSIONS["image"]
+    allowed_video_extensions = ALLOWED_EXTENSIONS["video"]
 
-    file_extension = Path(file.filename).suffix.lower()
+    file_extension = Path(filename).suffix.lower()
 
     if file_type == "image" and file_extension not in allowed_image_extensions:
         raise HTTPException(
@@ -547,26 +806,134 @@ async def upload_file(file: UploadFile = File(...), file_type: str = "image"):
             detail=f"Invalid video file. Allowed: {', '.join(allowed_video_extensions)}"
         )
 
-    # Generate unique filename
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = UPLOAD_DIR / f"{file_type}s" / unique_filename
-
-    # Save file
+    # Stream file to disk in chunks, stored under its SHA-256
     try:
-        contents = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        stored = await stream_to_store(form.chunks(), file_type, file_extension, max_size)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except MalformedUpload as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to save file: {str(e)}")
 
+    if file_type == "image":
+        image_worker.submit(stored.url)
+
     # Return the URL path
-    file_url = f"/uploads/{file_type}s/{unique_filename}"
-    return {"url": file_url, "filename": file.filename, "size": len(contents)}
+    return {
+        "url": stored.url,
+        "filename": filename,
+        "size": stored.size,
+        "sha256": stored.sha256,
+        "deduplicated": stored.deduplicated,
+    }
+
+
+@app.get("/api/upload/lookup")
+def lookup_upload(sha256: str, file_type: str = "image"):
+    """
+    Find an already stored file by its SHA-256, so a client can skip
+    re-uploading content the server already has.
+    """
+    file_url = find_by_hash(file_type, sha256)
+    if not file_url:
+        raise HTTPException(status_code=404, detail="File not found")
+    return {"url": file_url, "sha256": sha256.lower()}
+
+
+# ============ Resumable (multipart) Upload ============
+
+@app.post("/api/upload/multipart", response_model=MultipartUploadStatus, status_code=201)
+def init_multipart_upload(payload: MultipartUploadInit):
+    """
+    Start a resumable upload. Send the parts with PUT .../parts/{n}
+    (in any order, in parallel if desired), then POST .../complete.
+    """
+    if payload.file_type not in ["image", "video"]:
+        raise HTTPException(
+            status_code=400, detail="file_type must be 'image' or 'video'")
+
+    file_extension = Path(payload.filename).suffix.lower()
+    allowed = ALLOWED_EXTENSIONS[payload.file_type]
+    if file_extension not in allowed:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid {payload.file_type} file. Allowed: {', '.join(allowed)}"
+        )
+
+    max_size = (settings.max_image_upload_size if payload.file_type == "image"
+                else settings.max_video_upload_size)
+    session = multipart_uploads.create(
+        payload.filename, payload.file_type, file_extension, max_size)
+    return MultipartUploadStatus(**session, parts=[])
+
+
+@app.get("/api/upload/multipart/{upload_id}", response_model=MultipartUploadStatus)
+def get_multipart_upload(upload_id: str):
+    """Get the parts received so far, to resume an interrupted upload."""
+    try:
+        session = multipart_uploads.load(upload_id)
+        parts = multipart_uploads.list_parts(upload_id)
+    except MultipartUploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return MultipartUploadStatus(**session, parts=parts)
+
+
+@app.put("/api/upload/multipart/{upload_id}/parts/{part_number}", response_model=MultipartUploadPart)
+async def upload_multipart_part(
+    upload_id: str,
+    part_number: int,
+    request: Request,
+    x_part_sha256: Optional[str] = Header(None),
+):
+    """
+    Upload one part as the raw request body. If the X-Part-SHA256 header is
+    sent, the part is rejected unless its SHA-256 matches.
+    """
+    try:
+        return await multipart_uploads.write_part(
+            upload_id, part_number, request.stream(), x_part_sha256)
+    except MultipartUploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+
+@app.post("/api/upload/multipart/{upload_id}/complete")
+async def complete_multipart_upload(upload_id: str, payload: MultipartUploadComplete = None):
+    """Assemble the parts into the final file and return its URL."""
+    try:
+        session = multipart_uploads.load(upload_id)
+        expected = None
+        if payload is not None and payload.parts is not None:
+            expected = [part.model_dump() for part in payload.parts]
+        stored = await multipart_uploads.complete(upload_id, expected)
+    except MultipartUploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    if session["file_type"] == "image":
+        image_worker.submit(stored.url)
+
+    return {
+        "url": stored.url,
+        "filename": session["filename"],
+        "size": stored.size,
+        "sha256": stored.sha256,
+        "deduplicated": stored.deduplicated,
+    }
+
+
+@app.delete("/api/upload/multipart/{upload_id}", status_code=204)
+def abort_multipart_upload(upload_id: str):
+    """Abort an upload and discard its parts."""
+    try:
+        multipart_uploads.abort(upload_id)
+    except MultipartUploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return None
 
 
 @app.delete("/api/upload")
-async def delete_file(file_url: str):
+def delete_file(file_url: str, db: Session = Depends(get_db)):
     """Delete an uploaded file by its URL path."""
     try:
         # Extract the relative path from URL
@@ -575,12 +942,25 @@ async def delete_file(file_url: str):
             file_path = UPLOAD_DIR / relative_path
 
             if file_path.exists() and file_path.is_file():
+                if not upload_references_ready.is_set():
+                    raise HTTPException(
+                        status_code=503,
+                        detail="Upload references are not loaded yet; try again shortly")
+                # Content-addressed files can be shared between articles
+                article_ids = referencing_articles(db, [file_url])
+                if article_ids:
+                    raise HTTPException(
+                        status_code=409,
+                        detail=f"File is still used by {len(article_ids)} article(s)")
                 os.remove(file_path)
+                media_files.invalidate(relative_path.removeprefix("videos/"))
                 return {"message": "File deleted successfully"}
             else:
                 raise HTTPException(status_code=404, detail="File not found")
         else:
             raise HTTPException(status_code=400, detail="Invalid file URL")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to delete file: {str(e)}")
@@ -589,134 +969,160 @@ async def delete_file(file_url: str):
 # ============ Feedback / Support ============
 
 @app.post("/api/feedback/submit")
-def submit_feedback(payload: FeedbackCreate):
+def submit_feedback(payload: FeedbackCreate, db: Session = Depends(get_db)):
     """
     Submit a support/feedback request.
     Returns the feedback object with a unique tracking token.
     """
-    with SessionLocal() as db:
-        # Generate unique token for tracking
-        tracking_token = str(uuid.uuid4())
-
-        # Parse category ID if provided
-        category_id = None
-        if payload.categoryId:
-            try:
-                category_id = int(payload.categoryId)
-                # Verify category exists
-                category = db.query(Category).filter(
-                    Category.id == category_id).first()
-                if not category:
-                    category_id = None
-            except (ValueError, TypeError):
+    # Generate unique token for tracking
+    tracking_token = str(uuid.uuid4())
+
+    # Parse category ID if provided
+    category_id = None
+    if payload.categoryId:
+        try:
+            category_id = int(payload.categoryId)
+            # Verify category exists
+            category = db.get(Category, category_id)
+            if not category:
                 category_id = None
-
-        # Create feedback record
-        feedback = Feedback(
-            email=payload.email,
-            name=payload.name,
-            subject=payload.subject,
-            message=payload.message,
-            category_id=category_id,
-            token=tracking_token,
-            status="pending"
-        )
-
-        db.add(feedback)
-        db.commit()
-        db.refresh(feedback)
-
-        # Send confirmation email to user
-        send_feedback_confirmation_email(
-            recipient_email=feedback.email,
-            recipient_name=feedback.name or "",
-            subject=feedback.subject,
-            message=feedback.message,
-            token=feedback.token,
-        )
-
-        return {
-            "success": True,
-            "feedback": FeedbackResponse.from_orm(feedback)
-        }
+        except (ValueError, TypeError):
+            category_id = None
+
+    # Create feedback record
+    feedback = Feedback(
+        email=payload.email,
+        name=payload.name,
+        subject=payload.subject,
+        message=payload.message,
+        category_id=category_id,
+        token=tracking_token,
+        status="pending"
+    )
+
+    db.add(feedback)
+
+    # Queue confirmation email to user in the same transaction
+    enqueue_email(
+        db,
+        "feedback_confirmation",
+        recipient_email=feedback.email,
+        recipient_name=feedback.name or "",
+        subject=feedback.subject,
+        message=feedback.message,
+        token=feedback.token,
+    )
+
+    db.commit()
+    db.refresh(feedback)
+    outbox_worker.notify()
+
+    return {
+        "success": True,
+        "feedback": FeedbackResponse.from_orm(feedback)
+    }
 
 
 @app.get("/api/feedback/{token}")
-def get_feedback_by_token(token: str):
+def get_feedback_by_token(token: str, db: Session = Depends(get_read_db)):
     """Get feedback details by tracking token."""
-    with SessionLocal() as db:
-        feedback = db.query(Feedback).filter(Feedback.token == token).first()
-        if not feedback:
-            raise HTTPException(status_code=404, detail="Feedback not found")
+    feedback = db.scalar(select(Feedback).where(Feedback.token == token))
+    if not feedback:
+        raise HTTPException(status_code=404, detail="Feedback not found")
 
-        return FeedbackResponse.from_orm(feedback)
+    return FeedbackResponse.from_orm(feedback)
 
 
 @app.get("/api/feedback", response_model=List[FeedbackResponse])
-def get_all_feedback(status: str = None, limit: int = 100):
-    """Get all feedback with optional status filter."""
-    with SessionLocal() as db:
-        query = db.query(Feedback)
-
-        if status:
-            query = query.filter(Feedback.status == status)
+def get_all_feedback(
+    response: Response,
+    status: str = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Get all feedback with optional status filter, newest first. Pass the
+    X-Next-Cursor header of a page as ``cursor`` to get the next one.
+    """
+    query = feedback_list_query(status)
+    if cursor:
+        query = query.where(seek_after(
+            FEEDBACK_SORT, decode_cursor(cursor, (datetime, int))))
 
-        feedbacks = query.order_by(
-            Feedback.created_at.desc()).limit(limit).all()
-        return [FeedbackResponse.from_orm(f) for f in feedbacks]
+    feedbacks = db.scalars(query.limit(limit + 1)).all()
+    if limit > 0 and len(feedbacks) > limit:
+        last = feedbacks[limit - 1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor((last.created_at, last.id))
+    return [FeedbackResponse.from_orm(f) for f in feedbacks[:limit]]
 
 
 @app.put("/api/feedback/{feedback_id}")
-def update_feedback(feedback_id: int, payload: FeedbackUpdate):
+def update_feedback(feedback_id: int, payload: FeedbackUpdate, db: Session = Depends(get_db)):
     """Update feedback status or admin response."""
-    with SessionLocal() as db:
-        feedback = db.query(Feedback).filter(
-            Feedback.id == feedback_id).first()
-        if not feedback:
-            raise HTTPException(status_code=404, detail="Feedback not found")
-
-        # Track if admin_response was updated
-        send_notification = False
-        if payload.admin_response is not None and payload.admin_response.strip():
-            feedback.admin_response = payload.admin_response
-            send_notification = True
-
-        if payload.status is not None:
-            feedback.status = payload.status
-
-        db.commit()
-        db.refresh(feedback)
-
-        # Send email notification if admin responded
-        if send_notification:
-            send_feedback_response_email(
-                recipient_email=feedback.email,
-                recipient_name=feedback.name or "",
-                subject=feedback.subject,
-                admin_response=feedback.admin_response,
-                token=feedback.token,
-            )
+    feedback = db.get(Feedback, feedback_id)
+    if not feedback:
+        raise HTTPException(status_code=404, detail="Feedback not found")
+
+    # Track if admin_response was updated
+    send_notification = False
+    if payload.admin_response is not None and payload.admin_response.strip():
+        feedback.admin_response = payload.admin_response
+        send_notification = True
+
+    if payload.status is not None:
+        feedback.status = payload.status
+
+    # Queue email notification if admin responded
+    if send_notification:
+        enqueue_email(
+            db,
+            "feedback_response",
+            recipient_email=feedback.email,
+            recipient_name=feedback.name or "",
+            subject=feedback.subject,
+            admin_response=feedback.admin_response,
+            token=feedback.token,
+        )
 
-        return FeedbackResponse.from_orm(feedback)
+    db.commit()
+    db.refresh(feedback)
+    if send_notification:
+        outbox_worker.notify()
+
+    return FeedbackResponse.from_orm(feedback)
 
 
 @app.delete("/api/feedback/{feedback_id}", status_code=204)
-def delete_feedback(feedback_id: int):
+def delete_feedback(feedback_id: int, db: Session = Depends(get_db)):
     """Delete a feedback entry."""
-    with SessionLocal() as db:
-        feedback = db.query(Feedback).filter(
-            Feedback.id == feedback_id).first()
-        if not feedback:
-            raise HTTPException(status_code=404, detail="Feedback not found")
+    feedback = db.get(Feedback, feedback_id)
+    if not feedback:
+        raise HTTPException(status_code=404, detail="Feedback not found")
 
-        db.delete(feedback)
-        db.commit()
+    db.delete(feedback)
+    db.commit()
 
-        return None
+    return None
+
+
+@app.get("/api/metrics/pool")
+async def get_pool_metrics(reset_peak: bool = False):
+    """
+    Connection pool counters for the request, background worker and replica
+    engines, plus replica health. ``reset_peak=true`` restarts peak tracking
+    after reading it.
+    """
+    result = {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+    if replica_router.replicas:
+        result["replica_health"] = replica_router.status()
+    if reset_peak:
+        for metrics in pool_metrics.values():
+            metrics.reset_peak()
+    return result
 
 
 @app.get("/api/health")
-def health():
-    with SessionLocal() as db:
-        db.execute(func.now())
+def health(db: Session = Depends(get_db)):
+    db.execute(select(func.now()))
     return {"status": "ok"}
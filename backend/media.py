@@ -0,0 +1,220 @@
+"""
+Media serving for uploaded videos.
+
+``MediaFiles`` is a small ASGI app for the ``/uploads/videos`` mount. Compared
+with the generic ``StaticFiles`` mount it:
+
+* keeps per-file metadata (size, ETag, Last-Modified, content type) in an
+  in-memory LRU instead of calling ``stat`` on every request; uploads are
+  never modified in place, so the cache needs no revalidation;
+* answers ``If-None-Match`` with 304 and honours ``If-Range``;
+* serves a single ``Range`` as 206 (416 when unsatisfiable);
+* hands the byte range to the server with the ASGI ``zerocopysend``
+  extension (``sendfile``) when the server offers it, and otherwise reads
+  large chunks with ``os.pread`` in a worker thread.
+"""
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from email.utils import formatdate
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+from anyio import to_thread
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+
+from backend.http_cache import etag_matches
+from backend.uploads import content_etag
+
+
+class MediaMeta(NamedTuple):
+    path: str
+    size: int
+    etag: str
+    last_modified: str
+    content_type: str
+
+
+class MediaFiles:
+    """Serves files below ``directory`` with cached metadata and byte ranges."""
+
+    def __init__(self, directory: Path, chunk_size: int = 1024 * 1024, cache_size: int = 4096):
+        self.directory = Path(directory).resolve()
+        self.chunk_size = chunk_size
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, MediaMeta]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        assert scope["type"] == "http"
+        if scope["method"] not in ("GET", "HEAD"):
+            await self._send_empty(send, 405, {"allow": "GET, HEAD"})
+            return
+
+        relative = scope["path"].removeprefix(scope.get("root_path", "")).lstrip("/")
+        meta = await self._lookup(relative)
+        if meta is None:
+            await self._send_empty(send, 404)
+            return
+
+        request_headers = Headers(scope=scope)
+        headers = {
+            "accept-ranges": "bytes",
+            "etag": meta.etag,
+            "last-modified": meta.last_modified,
+            "content-type": meta.content_type,
+            "cache-control": "public, max-age=31536000, immutable",
+        }
+
+        if etag_matches(request_headers.get("if-none-match"), meta.etag):
+            await self._send_empty(send, 304, headers)
+            return
+
+        start, end, status = 0, meta.size, 200
+        http_range = request_headers.get("range")
+        if_range = request_headers.get("if-range")
+        if http_range and (if_range is None or if_range in (meta.etag, meta.last_modified)):
+            parsed = self._parse_range(http_range, meta.size)
+            if parsed is None:
+                headers["content-range"] = f"bytes */{meta.size}"
+                await self._send_empty(send, 416, headers)
+                return
+            if parsed != (0, meta.size):
+                start, end = parsed
+                status = 206
+                headers["content-range"] = f"bytes {start}-{end - 1}/{meta.size}"
+
+        file = None
+        if scope["method"] == "GET" and start < end:
+            try:
+                file = await to_thread.run_sync(open, meta.path, "rb")
+            except FileNotFoundError:
+                # Removed since its metadata was cached (e.g. by upload_gc)
+                self.invalidate(relative)
+                await self._send_empty(send, 404)
+                return
+
+        headers["content-length"] = str(end - start)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+        })
+        if file is None:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        try:
+            await self._send_file(scope, send, file, start, end)
+        finally:
+            file.close()
+
+    def invalidate(self, relative: Optional[str] = None) -> None:
+        """Drop cached metadata for one file, or for all files."""
+        with self._lock:
+            if relative is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(relative, None)
+
+    async def _lookup(self, relative: str) -> Optional[MediaMeta]:
+        with self._lock:
+            meta = self._cache.get(relative)
+            if meta is not None:
+                self._cache.move_to_end(relative)
+                return meta
+
+        meta = await to_thread.run_sync(self._stat, relative)
+        if meta is not None:
+            with self._lock:
+                self._cache[relative] = meta
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return meta
+
+    def _stat(self, relative: str) -> Optional[MediaMeta]:
+        path = (self.directory / relative).resolve()
+        if self.directory not in path.parents:
+            return None
+        try:
+            stat = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not os.path.isfile(path):
+            return None
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        return MediaMeta(
+            path=str(path),
+            size=stat.st_size,
+            # The content hash, not the mtime: upload reuse refreshes that
+            etag=content_etag(path) or f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+            last_modified=formatdate(stat.st_mtime, usegmt=True),
+            content_type=content_type,
+        )
+
+    @staticmethod
+    def _parse_range(value: str, size: int) -> Optional[Tuple[int, int]]:
+        """
+        Parse a Range header into a half-open (start, end). Only the first
+        range of a multi-range request is honoured; unparseable headers are
+        ignored (full response), unsatisfiable ones return None (416).
+        """
+        unit, _, ranges = value.partition("=")
+        if unit.strip().lower() != "bytes":
+            return (0, size)
+        first = ranges.split(",")[0].strip()
+        start_text, _, end_text = first.partition("-")
+        try:
+            if start_text == "":
+                length = int(end_text)
+                if length <= 0:
+                    return None
+                return (max(0, size - length), size)
+            start = int(start_text)
+            end = int(end_text) + 1 if end_text else size
+        except ValueError:
+            return (0, size)
+        if start >= size or end <= start:
+            return None
+        return (start, min(end, size))
+
+    async def _send_file(self, scope: Scope, send: Send, file, start: int, end: int) -> None:
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            await send({
+                "type": "http.response.zerocopysend",
+                "file": file,
+                "offset": start,
+                "count": end - start,
+                "more_body": False,
+            })
+            return
+
+        fd = file.fileno()
+        offset = start
+        while offset < end:
+            count = min(self.chunk_size, end - offset)
+            chunk = await to_thread.run_sync(os.pread, fd, count, offset)
+            if not chunk:
+                break
+            offset += len(chunk)
+            await send({
+                "type": "http.response.body",
+                "body": chunk,
+                "more_body": offset < end,
+            })
+        if offset < end:
+            # File shrank underneath us; end the response cleanly
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    @staticmethod
+    async def _send_empty(send: Send, status: int, headers: Optional[dict] = None) -> None:
+        headers = dict(headers or {})
+        headers["content-length"] = "0"
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+        })
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
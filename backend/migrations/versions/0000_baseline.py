@@ -0,0 +1,74 @@
+"""baseline schema: categories, articles, feedback
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-17
+
+The tables the app created with ``Base.metadata.create_all`` before it had
+migrations. A database created that way already has them: mark it as being
+at this revision with ``alembic stamp 0000`` and then upgrade.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0000"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "categories",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(100), nullable=False, unique=True),
+        sa.Column("description", sa.String(512), nullable=True),
+        sa.Column("color", sa.String(16), nullable=True),
+        sa.Column("created_at", sa.DateTime(),
+                  server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(),
+                  server_default=sa.func.now(), nullable=False),
+    )
+    op.create_table(
+        "articles",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("slug", sa.String(255), nullable=False, unique=True),
+        sa.Column("excerpt", sa.String(512), nullable=True),
+        sa.Column("content", sa.JSON(), nullable=True),
+        sa.Column("url", sa.String(512), nullable=True),
+        sa.Column("is_published", sa.Integer(), nullable=False),
+        sa.Column("is_featured", sa.Integer(), nullable=False),
+        sa.Column("view_count", sa.Integer(), nullable=False),
+        sa.Column("order", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(),
+                  server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(),
+                  server_default=sa.func.now(), nullable=False),
+        sa.Column("category_id", sa.Integer(),
+                  sa.ForeignKey("categories.id"), nullable=False),
+    )
+    op.create_table(
+        "feedback",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("name", sa.String(255), nullable=True),
+        sa.Column("subject", sa.String(512), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("category_id", sa.Integer(),
+                  sa.ForeignKey("categories.id"), nullable=True),
+        sa.Column("token", sa.String(64), nullable=False, unique=True),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("admin_response", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(),
+                  server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(),
+                  server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("feedback")
+    op.drop_table("articles")
+    op.drop_table("categories")
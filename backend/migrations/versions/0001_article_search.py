@@ -0,0 +1,46 @@
+"""article_search full-text shadow table
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-17
+
+One flattened text document per article (title, excerpt and every content
+block), indexed with MySQL FULLTEXT or stored in an SQLite FTS5 virtual
+table. Populate it with ``python -m backend.reindex``.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+revision = "0001"
+down_revision = "0000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "mysql":
+        op.create_table(
+            "article_search",
+            sa.Column("article_id", sa.Integer(), sa.ForeignKey(
+                "articles.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("body", mysql.MEDIUMTEXT(), nullable=False),
+            mysql_engine="InnoDB",
+        )
+        op.create_index("ix_article_search_body", "article_search",
+                        ["body"], mysql_prefix="FULLTEXT")
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE article_search "
+            "USING fts5(body, tokenize = 'unicode61')"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "mysql":
+        op.drop_index("ix_article_search_body", table_name="article_search")
+    if dialect in ("mysql", "sqlite"):
+        op.drop_table("article_search")
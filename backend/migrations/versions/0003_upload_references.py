@@ -0,0 +1,52 @@
+"""upload_references table
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+Links uploaded files to the articles whose content blocks use them, and
+backfills the links for existing articles.
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    references = op.create_table(
+        "upload_references",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("article_id", sa.Integer(), sa.ForeignKey(
+            "articles.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("url", sa.String(512), nullable=False),
+        sa.Column("created_at", sa.DateTime(),
+                  server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("article_id", "url"),
+    )
+    op.create_index("ix_upload_references_url", "upload_references", ["url"])
+
+    rows = []
+    articles = op.get_bind().execute(sa.text("SELECT id, content FROM articles"))
+    for article_id, content in articles:
+        if isinstance(content, str):
+            content = json.loads(content)
+        urls = set()
+        for block in content or []:
+            for url in (block.get("images") or []) + (block.get("videos") or []):
+                if url and url.startswith("/uploads/"):
+                    urls.add(url)
+        rows.extend({"article_id": article_id, "url": url} for url in urls)
+    if rows:
+        op.bulk_insert(references, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_upload_references_url", table_name="upload_references")
+    op.drop_table("upload_references")
@@ -0,0 +1,35 @@
+"""image_variants table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "image_variants",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("source_url", sa.String(512), nullable=False),
+        sa.Column("url", sa.String(512), nullable=False),
+        sa.Column("width", sa.Integer(), nullable=False),
+        sa.Column("format", sa.String(16), nullable=False),
+        sa.Column("created_at", sa.DateTime(),
+                  server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("url"),
+    )
+    op.create_index("ix_image_variants_source_url",
+                    "image_variants", ["source_url"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_image_variants_source_url", table_name="image_variants")
+    op.drop_table("image_variants")
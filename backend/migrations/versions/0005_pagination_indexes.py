@@ -0,0 +1,37 @@
+"""keyset pagination indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+
+Indexes matching the sort keys of the cursor-paginated listings, so each
+page is an index range scan starting at the cursor.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # GET /api/articles: ORDER BY `order`, created_at DESC, id DESC
+    op.create_index(
+        "ix_articles_order_created_at_id",
+        "articles",
+        ["order", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    # GET /api/feedback: ORDER BY created_at DESC, id DESC
+    op.create_index(
+        "ix_feedback_created_at_id",
+        "feedback",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_feedback_created_at_id", table_name="feedback")
+    op.drop_index("ix_articles_order_created_at_id", table_name="articles")
@@ -0,0 +1,54 @@
+"""composite indexes for the filtered listings
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+
+Indexes matched to the query shapes in backend/queries.py: filtered article
+listings in their sort order, the published-listing ETag aggregate (covered
+without touching the table), per-category article counts and the feedback
+listing filtered by status. ``python -m backend.explaincheck`` verifies the
+plans.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # GET /api/articles?category_id=, GET /api/categories counts
+    op.create_index(
+        "ix_articles_category_order",
+        "articles",
+        ["category_id", "order", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    # GET /api/articles[/index]?is_published=
+    op.create_index(
+        "ix_articles_published_order",
+        "articles",
+        ["is_published", "order", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    # ETag aggregate of the published listings
+    op.create_index(
+        "ix_articles_published_stats",
+        "articles",
+        ["is_published", "category_id", "updated_at", "view_count"],
+    )
+    # GET /api/feedback?status=
+    op.create_index(
+        "ix_feedback_status_created_at_id",
+        "feedback",
+        ["status", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_feedback_status_created_at_id", table_name="feedback")
+    op.drop_index("ix_articles_published_stats", table_name="articles")
+    op.drop_index("ix_articles_published_order", table_name="articles")
+    op.drop_index("ix_articles_category_order", table_name="articles")
@@ -1,11 +1,24 @@
 from sqlalchemy.orm import declarative_base, relationship, Mapped, mapped_column
-from sqlalchemy import Integer, String, Text, ForeignKey, JSON, DateTime
+from sqlalchemy import Integer, String, Text, ForeignKey, JSON, DateTime, Index, UniqueConstraint
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.sql import func
 from typing import Optional, List
 from datetime import datetime
 
 Base = declarative_base()
 
+# Server-set timestamps. SQLite's CURRENT_TIMESTAMP has no fractional part,
+# while SQLAlchemy binds datetimes with microseconds; SQLite compares them as
+# text, so an equal value would sort after the stored one. Binding them the
+# way SQLite stores them keeps comparisons (keyset cursors) exact.
+Timestamp = DateTime().with_variant(
+    sqlite.DATETIME(truncate_microseconds=True), "sqlite")
+
+# Relationships never load implicitly: a query that needs related rows says
+# how (joinedload / contains_eager for many-to-one, selectinload for
+# collections), and a forgotten option raises instead of issuing one SELECT
+# per row. Objects already in the session's identity map are still returned.
+
 
 class Category(Base):
     __tablename__ = "categories"
@@ -17,11 +30,13 @@ class Category(Base):
         String(512), nullable=True)
     color: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), nullable=False)
+        Timestamp, server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+        Timestamp, server_default=func.now(), onupdate=func.now(), nullable=False)
 
-    articles = relationship("Article", back_populates="category")
+    # No implicit load on delete either; categories with articles can't be deleted
+    articles = relationship(
+        "Article", back_populates="category", lazy="raise_on_sql", passive_deletes=True)
 
 
 class Article(Base):
@@ -43,13 +58,27 @@ class Article(Base):
     view_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     order: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), nullable=False)
+        Timestamp, server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+        Timestamp, server_default=func.now(), onupdate=func.now(), nullable=False)
 
     category_id: Mapped[int] = mapped_column(
         ForeignKey("categories.id"), nullable=False)
-    category = relationship("Category", back_populates="articles")
+    category = relationship("Category", back_populates="articles", lazy="raise_on_sql")
+
+
+# Article listings (see backend/queries.py): ORDER BY order, created_at DESC,
+# id DESC, unfiltered, per category or published only. The category index
+# also covers the per-category counts; the stats index covers the ETag
+# aggregate of published listings.
+Index("ix_articles_order_created_at_id",
+      Article.order, Article.created_at.desc(), Article.id.desc())
+Index("ix_articles_category_order",
+      Article.category_id, Article.order, Article.created_at.desc(), Article.id.desc())
+Index("ix_articles_published_order",
+      Article.is_published, Article.order, Article.created_at.desc(), Article.id.desc())
+Index("ix_articles_published_stats",
+      Article.is_published, Article.category_id, Article.updated_at, Article.view_count)
 
 
 class Feedback(Base):
@@ -69,8 +98,69 @@ class Feedback(Base):
         String(50), default="pending", nullable=False)
     admin_response: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), nullable=False)
+        Timestamp, server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        Timestamp, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    category = relationship("Category", lazy="raise_on_sql")
+
+
+# GET /api/feedback[?status=]: ORDER BY created_at DESC, id DESC
+Index("ix_feedback_created_at_id", Feedback.created_at.desc(), Feedback.id.desc())
+Index("ix_feedback_status_created_at_id",
+      Feedback.status, Feedback.created_at.desc(), Feedback.id.desc())
+
+
+class EmailOutbox(Base):
+    """Emails waiting to be delivered by the background outbox workers."""
+    __tablename__ = "email_outbox"
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True)
+    # feedback_confirmation, feedback_response
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    # Keyword arguments for the email_utils sender of this kind
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    status: Mapped[str] = mapped_column(
+        # pending, sending, sent, failed
+        String(20), default="pending", nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # When the row may next be claimed (retry time, or lease expiry while sending)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, index=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        Timestamp, server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+        Timestamp, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class UploadReference(Base):
+    """Links an uploaded file (by URL) to an article whose content uses it."""
+    __tablename__ = "upload_references"
+    __table_args__ = (UniqueConstraint("article_id", "url"),)
 
-    category = relationship("Category")
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True)
+    article_id: Mapped[int] = mapped_column(
+        ForeignKey("articles.id", ondelete="CASCADE"), nullable=False)
+    url: Mapped[str] = mapped_column(String(512), nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        Timestamp, server_default=func.now(), nullable=False)
+
+
+class ImageVariant(Base):
+    """A resized / re-encoded copy of an uploaded image."""
+    __tablename__ = "image_variants"
+    __table_args__ = (UniqueConstraint("url"),)
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True)
+    source_url: Mapped[str] = mapped_column(
+        String(512), nullable=False, index=True)
+    url: Mapped[str] = mapped_column(String(512), nullable=False)
+    width: Mapped[int] = mapped_column(Integer, nullable=False)
+    # webp, avif, or "original": the source image itself, recording its width
+    format: Mapped[str] = mapped_column(String(16), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        Timestamp, server_default=func.now(), nullable=False)
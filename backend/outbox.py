@@ -0,0 +1,175 @@
+"""
+Transactional email outbox.
+
+Handlers call ``enqueue_email`` with the same session that writes the
+feedback row, so the email is stored in the same transaction and the HTTP
+response never waits on SMTP. ``OutboxWorker`` runs a small pool of threads
+that claim due rows, send them through ``email_utils`` and retry failures
+with exponential backoff.
+"""
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.models import EmailOutbox
+from backend.email_utils import send_feedback_confirmation_email, send_feedback_response_email
+
+
+SENDERS: Dict[str, Callable[..., bool]] = {
+    "feedback_confirmation": send_feedback_confirmation_email,
+    "feedback_response": send_feedback_response_email,
+}
+
+
+def enqueue_email(db: Session, kind: str, **payload) -> EmailOutbox:
+    """Add an email to the outbox. It is sent once ``db`` commits."""
+    if kind not in SENDERS:
+        raise ValueError(f"Unknown email kind '{kind}'")
+    entry = EmailOutbox(
+        kind=kind,
+        payload=payload,
+        status="pending",
+        attempts=0,
+        next_attempt_at=datetime.now(),
+    )
+    db.add(entry)
+    return entry
+
+
+class OutboxWorker:
+    """
+    Pool of threads draining the email outbox.
+
+    A row is claimed by an UPDATE that only succeeds if the row is still in
+    the state the worker read, so several workers (or processes) never send
+    the same email twice. While sending, ``next_attempt_at`` doubles as a
+    lease: a row left in ``sending`` by a crashed worker becomes claimable
+    again after ``lease_seconds``.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        workers: int = 2,
+        poll_interval: float = 5.0,
+        batch_size: int = 10,
+        max_attempts: int = 6,
+        backoff_base: float = 30.0,
+        lease_seconds: float = 300.0,
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.lease_seconds = lease_seconds
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def notify(self) -> None:
+        """Wake the workers after new emails were committed."""
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stopped.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"email-outbox-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def process_due(self) -> int:
+        """Claim and send one batch of due emails. Returns how many were claimed."""
+        claimed = self._claim_batch()
+        for entry_id, kind, payload, attempts in claimed:
+            if self._stopped.is_set():
+                # Leave the rest to be reclaimed when their lease expires
+                break
+            self._deliver(entry_id, kind, payload, attempts)
+        return len(claimed)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                if self.process_due():
+                    continue
+            except Exception as e:
+                print(f"[EMAIL OUTBOX ERROR] {str(e)}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _claim_batch(self):
+        now = datetime.now()
+        lease_until = now + timedelta(seconds=self.lease_seconds)
+        claimed = []
+        with self.session_factory() as db:
+            candidates = (
+                db.query(EmailOutbox)
+                .filter(
+                    or_(EmailOutbox.status == "pending",
+                        EmailOutbox.status == "sending"),
+                    EmailOutbox.next_attempt_at <= now,
+                )
+                .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+                .limit(self.batch_size)
+                .all()
+            )
+            for entry in candidates:
+                result = db.execute(
+                    update(EmailOutbox)
+                    .where(
+                        EmailOutbox.id == entry.id,
+                        EmailOutbox.status == entry.status,
+                        EmailOutbox.next_attempt_at == entry.next_attempt_at,
+                    )
+                    .values(status="sending", next_attempt_at=lease_until)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 1:
+                    claimed.append(
+                        (entry.id, entry.kind, entry.payload, entry.attempts))
+            db.commit()
+        return claimed
+
+    def _deliver(self, entry_id: int, kind: str, payload: dict, attempts: int) -> None:
+        error = None
+        try:
+            sent = SENDERS[kind](**payload)
+            if not sent:
+                error = "Sender reported failure"
+        except Exception as e:
+            error = str(e)
+
+        attempts += 1
+        values = {"attempts": attempts, "last_error": error}
+        if error is None:
+            values["status"] = "sent"
+        elif attempts >= self.max_attempts:
+            values["status"] = "failed"
+        else:
+            delay = self.backoff_base * (2 ** (attempts - 1))
+            values["status"] = "pending"
+            values["next_attempt_at"] = datetime.now() + timedelta(seconds=delay)
+
+        with self.session_factory() as db:
+            db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id == entry_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
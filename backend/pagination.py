@@ -0,0 +1,61 @@
+"""
+Keyset (cursor) pagination.
+
+A page is fetched by seeking past the sort key of the previous page's last
+row instead of skipping ``offset`` rows, so with an index on the sort key
+every page costs the same however deep it is. The cursor handed to clients
+(``X-Next-Cursor``) is that sort key, base64url-encoded JSON: opaque to
+clients, but stateless on the server.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import ColumnElement, and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for a row's sort key values."""
+    data = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """Sort key values from ``cursor``; 400 if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        if not isinstance(data, list) or len(data) != len(types):
+            raise ValueError("wrong number of values")
+        return [
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for v, t in zip(data, types)
+        ]
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def seek_after(keys: Sequence[Tuple[ColumnElement, bool]], values: Sequence[Any]):
+    """
+    WHERE clause selecting the rows after ``values`` in the order of ``keys``,
+    a list of ``(column, descending)``. Mixed directions are supported, so it
+    is spelled out as ``a > x OR (a = x AND (b < y OR ...))`` rather than a
+    row-value comparison.
+    """
+    (column, descending), value = keys[-1], values[-1]
+    clause = column < value if descending else column > value
+    for (column, descending), value in zip(reversed(keys[:-1]), reversed(values[:-1])):
+        past = column < value if descending else column > value
+        clause = or_(past, and_(column == value, clause))
+    return clause
+
+
+def sort_columns(keys: Sequence[Tuple[ColumnElement, bool]]) -> List[ColumnElement]:
+    """ORDER BY clauses for ``keys``."""
+    return [column.desc() if descending else column for column, descending in keys]
@@ -0,0 +1,138 @@
+"""
+Connection pool instrumentation.
+
+``PoolMetrics`` listens to an engine's pool events (checkout, checkin,
+connect, invalidate) to track connections in use, their peak and overflow.
+``TimedQueuePool`` also measures how long each checkout waited for a
+connection, including timeouts, which the pool events cannot see. A
+snapshot of both is served by ``GET /api/metrics/pool``, so pool sizes can
+be chosen from observed waits instead of guesses.
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+
+# Upper bounds (milliseconds) of the checkout wait histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class TimedQueuePool(QueuePool):
+    metrics: Optional["PoolMetrics"] = None
+
+    def connect(self):
+        metrics = self.metrics
+        if metrics is None:
+            return super().connect()
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            metrics.record_timeout()
+            raise
+        metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # Engine.dispose() swaps in a recreated pool; keep reporting to us
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class PoolMetrics:
+    """Counters for one engine's connection pool."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+        pool = engine.pool
+        if isinstance(pool, TimedQueuePool):
+            pool.metrics = self
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def record_wait(self, seconds: float) -> None:
+        ms = seconds * 1000
+        index = next(
+            (i for i, bound in enumerate(WAIT_BUCKETS_MS) if ms <= bound),
+            len(WAIT_BUCKETS_MS))
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.wait_buckets[index] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def reset_peak(self) -> None:
+        with self._lock:
+            self.peak_in_use = self.in_use
+
+    def snapshot(self) -> Dict:
+        pool = self.engine.pool
+        with self._lock:
+            timed = sum(self.wait_buckets)
+            result = {
+                "pool": type(pool).__name__,
+                "checkouts": self.checkouts,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_ms": {
+                    "count": timed,
+                    "avg": round(self.wait_total * 1000 / timed, 3) if timed else 0.0,
+                    "max": round(self.wait_max * 1000, 3),
+                    "buckets": {
+                        **{f"le_{bound}": n for bound, n in zip(WAIT_BUCKETS_MS, self.wait_buckets)},
+                        f"gt_{WAIT_BUCKETS_MS[-1]}": self.wait_buckets[-1],
+                    },
+                },
+            }
+        if isinstance(pool, QueuePool):
+            result.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                # Negative while fewer than pool_size connections are open
+                overflow=pool.overflow(),
+                timeout=pool.timeout(),
+            )
+        return result
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
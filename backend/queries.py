@@ -0,0 +1,99 @@
+"""
+Query shapes of the hot read paths.
+
+The listing handlers build their statements here so the exact same shapes
+can be checked against the indexes by ``backend.explaincheck``. Each builder
+names the index (see ``models.py`` and the migrations) it is meant to use.
+"""
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import contains_eager, load_only
+
+from backend.models import Article, Category, Feedback
+from backend.pagination import sort_columns
+
+# Listing sort keys as (column, descending); the id makes them unique, so a
+# keyset cursor never skips or repeats rows that tie on the other columns.
+ARTICLE_SORT = [(Article.order, False), (Article.created_at, True), (Article.id, True)]
+FEEDBACK_SORT = [(Feedback.created_at, True), (Feedback.id, True)]
+
+
+def filter_articles(query, category_id: int = None, is_published: bool = None, is_featured: bool = None):
+    """Apply the optional listing filters shared by the article list endpoints."""
+    if category_id is not None:
+        query = query.filter(Article.category_id == category_id)
+    if is_published is not None:
+        query = query.filter(Article.is_published == is_published)
+    if is_featured is not None:
+        query = query.filter(Article.is_featured == is_featured)
+    return query
+
+
+def article_list_query(category_id: int = None, is_published: bool = None,
+                       is_featured: bool = None) -> Select:
+    """
+    GET /api/articles rows. Ordered by ix_articles_category_order,
+    ix_articles_published_order or ix_articles_order_created_at_id,
+    depending on the filter.
+    """
+    query = select(Article).join(Category).options(
+        contains_eager(Article.category))
+    query = filter_articles(query, category_id, is_published, is_featured)
+    return query.order_by(*sort_columns(ARTICLE_SORT))
+
+
+def article_index_query(category_id: int = None, is_published: bool = None,
+                        is_featured: bool = None) -> Select:
+    """GET /api/articles/index rows: link columns only, same order as the listing."""
+    query = (
+        select(Article)
+        .join(Category)
+        .options(
+            load_only(
+                Article.id,
+                Article.title,
+                Article.slug,
+                Article.excerpt,
+                Article.is_featured,
+                Article.order,
+                Article.category_id,
+            ),
+            contains_eager(Article.category).load_only(
+                Category.name, Category.color),
+        )
+    )
+    query = filter_articles(query, category_id, is_published, is_featured)
+    return query.order_by(*sort_columns(ARTICLE_SORT))
+
+
+def article_stats_query(category_id: int = None, is_published: bool = None,
+                        is_featured: bool = None) -> Select:
+    """
+    Row count, newest edit, total views and newest category edit of a
+    listing, for its ETag. ix_articles_published_stats covers it for the
+    published listings, ix_articles_category_order for the rest.
+    """
+    query = select(
+        func.count(Article.id),
+        func.max(Article.updated_at),
+        func.sum(Article.view_count),
+        func.max(Category.updated_at),
+    ).select_from(Article).join(Category)
+    return filter_articles(query, category_id, is_published, is_featured)
+
+
+def category_counts_query() -> Select:
+    """Categories with their article counts, counted on ix_articles_category_order."""
+    return (
+        select(Category, func.count(Article.id))
+        .outerjoin(Article, Article.category_id == Category.id)
+        .group_by(Category.id)
+        .order_by(Category.id)
+    )
+
+
+def feedback_list_query(status: str = None) -> Select:
+    """GET /api/feedback rows, on ix_feedback_status_created_at_id when filtered."""
+    query = select(Feedback)
+    if status:
+        query = query.where(Feedback.status == status)
+    return query.order_by(*sort_columns(FEEDBACK_SORT))
@@ -0,0 +1,162 @@
+"""
+Pin the number of SQL statements each API endpoint issues.
+
+Seeds a throwaway SQLite database, calls every endpoint in ``EXPECTED``
+in-process and counts the statements executed on all engines while it runs.
+Any count that differs from the pinned one (an N+1 lazy load creeping in, a
+lost eager-load option) is reported and the exit status is 1, so the script
+can gate CI. After an intentional change, re-run with ``--update`` and copy
+the printed table into ``EXPECTED``.
+
+    python -m backend.querycount [--update]
+
+The app's lifespan is not run, so the background workers (outbox, view
+counter, image variants) stay idle and cannot add statements of their own.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+# (method, endpoint) -> statements per request. Listings include the ETag
+# aggregate; search and suggest include their index's freshness probe.
+EXPECTED: Dict[Tuple[str, str], int] = {
+    ("GET", "/api/categories"): 1,
+    ("GET", "/api/categories (cached)"): 0,
+    ("GET", "/api/articles"): 2,
+    ("GET", "/api/articles/index"): 2,
+    ("GET", "/api/articles/{id}"): 2,
+    ("GET", "/api/articles/slug/{slug}"): 2,
+    ("POST", "/api/search/articles"): 2,
+    ("GET", "/api/search/suggest"): 1,
+    ("GET", "/api/feedback"): 1,
+    ("GET", "/api/feedback/{token}"): 1,
+    ("POST", "/api/articles"): 5,
+    ("PUT", "/api/articles/{id}"): 3,
+    ("DELETE", "/api/articles/{id}"): 3,
+}
+
+
+class StatementCounter:
+    """Counts statements executed on a set of engines."""
+
+    def __init__(self, engines, verbose: bool = False):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.verbose = verbose
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.count += 1
+        if self.verbose:
+            print("    " + " ".join(statement.split())[:160])
+
+    def reset(self) -> int:
+        with self._lock:
+            count, self.count = self.count, 0
+        return count
+
+
+def requests_for(client) -> List[Tuple[str, str, str, Optional[dict]]]:
+    """(method, pinned name, concrete path, JSON body) for every endpoint."""
+    article = client.get("/api/articles").json()[0]
+    feedback = client.post("/api/feedback/submit", json={
+        "email": "querycount@example.com",
+        "subject": "Query count",
+        "message": "Seeded by backend.querycount",
+    }).json()["feedback"]
+    new_article = {
+        "title": "Query count",
+        "slug": "query-count",
+        "content": [{"title": "Step", "description": "Text"}],
+        "category_id": article["category_id"],
+    }
+    return [
+        ("GET", "/api/categories", "/api/categories", None),
+        ("GET", "/api/categories (cached)", "/api/categories", None),
+        ("GET", "/api/articles", "/api/articles", None),
+        ("GET", "/api/articles/index", "/api/articles/index", None),
+        ("GET", "/api/articles/{id}", f"/api/articles/{article['id']}", None),
+        ("GET", "/api/articles/slug/{slug}", f"/api/articles/slug/{article['slug']}", None),
+        ("POST", "/api/search/articles", "/api/search/articles", {"query": "start"}),
+        ("GET", "/api/search/suggest", "/api/search/suggest?q=get", None),
+        ("GET", "/api/feedback", "/api/feedback", None),
+        ("GET", "/api/feedback/{token}", f"/api/feedback/{feedback['token']}", None),
+        ("POST", "/api/articles", "/api/articles", new_article),
+        ("PUT", "/api/articles/{id}", "/api/articles/{new_id}", {"title": "Query count 2"}),
+        ("DELETE", "/api/articles/{id}", "/api/articles/{new_id}", None),
+    ]
+
+
+def run(verbose: bool = False) -> Dict[Tuple[str, str], int]:
+    # Imported here: the app reads DATABASE_URL when it is imported
+    from fastapi.testclient import TestClient
+
+    from backend import main
+    from backend.seed import seed
+
+    seed()
+    with main.SessionLocal() as db:
+        main.search_backend.rebuild(db)
+        main.suggest_index.rebuild(db)
+    client = TestClient(main.app)
+    plan = requests_for(client)
+    counter = StatementCounter(
+        [main.engine, main.request_engine]
+        + [replica.engine for replica in main.replica_router.replicas],
+        verbose=verbose)
+
+    counts = {}
+    new_id = None
+    for method, name, path, body in plan:
+        path = path.replace("{new_id}", str(new_id))
+        if verbose:
+            print(f"{method} {name}")
+        counter.reset()
+        response = client.request(method, path, json=body)
+        counts[(method, name)] = counter.reset()
+        if response.status_code >= 400:
+            raise SystemExit(f"{method} {path} failed: {response.status_code} {response.text}")
+        if method == "POST" and name == "/api/articles":
+            new_id = response.json()["id"]
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--update", action="store_true",
+                        help="print the measured counts as a new EXPECTED table")
+    parser.add_argument("--verbose", action="store_true",
+                        help="print each endpoint's statements")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/querycount.db"
+        os.environ.pop("DATABASE_REPLICA_URLS", None)
+        # Count the in-memory indexes' freshness probe on every lookup (the
+        # worst case) rather than depending on how long the run took
+        os.environ["SEARCH_REFRESH_INTERVAL"] = "0"
+        counts = run(args.verbose)
+
+    if args.update:
+        for key, count in counts.items():
+            print(f"    {key!r}: {count},")
+        return
+
+    failed = False
+    for key, count in counts.items():
+        expected = EXPECTED.get(key)
+        status = "ok" if count == expected else "CHANGED"
+        failed |= count != expected
+        print(f"{status:8} {key[0]:6} {key[1]:32} expected {expected}, got {count}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
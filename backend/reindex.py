@@ -0,0 +1,23 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import engine_options, sync_database_url
+from backend.search import FullTextSearchBackend
+from backend.settings import get_settings
+
+
+def reindex():
+    settings = get_settings()
+    engine = create_engine(sync_database_url(settings.database_url),
+                           **engine_options(settings, pool_size=1))
+    SessionLocal = sessionmaker(bind=engine)
+
+    backend = FullTextSearchBackend(engine)
+    with SessionLocal() as db:
+        backend.rebuild(db)
+        count = backend.backfill(db)
+    print(f"Indexed {count} article(s) into {backend.TABLE}")
+
+
+if __name__ == "__main__":
+    reindex()
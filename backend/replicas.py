@@ -0,0 +1,139 @@
+"""
+Read-replica routing.
+
+Read-only handlers take their session from ``ReplicaRouter.engine_for_read``,
+which hands out the configured replicas round-robin, skipping any that
+failed their last health check (``SELECT 1`` every few seconds). With no
+replicas configured, or none healthy, reads go to the primary.
+
+Replication is asynchronous, so a client that just wrote may read stale
+data from a replica. Write requests therefore set a short-lived cookie
+(``READ_PRIMARY_COOKIE``); while it is present, that client's reads are
+served by the primary (read-your-writes).
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+
+class Replica:
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: List[Engine],
+        check_interval: float = 5.0,
+        check_timeout: float = 2.0,
+        sticky_seconds: int = 10,
+    ):
+        self.primary = primary
+        self.replicas = [
+            Replica(f"replica-{i}", engine) for i, engine in enumerate(replicas)]
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.sticky_seconds = sticky_seconds
+        self._next = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def engine_for_read(self, request: Optional[Request] = None) -> Engine:
+        """A healthy replica in round-robin order, or the primary."""
+        if request is not None and self.reads_from_primary(request):
+            return self.primary
+        healthy = [r for r in self.replicas if r.healthy]
+        if not healthy:
+            return self.primary
+        replica = healthy[self._next % len(healthy)]
+        self._next += 1
+        return replica.engine
+
+    def reads_from_primary(self, request: Request) -> bool:
+        """True while the client is inside its read-your-writes window."""
+        value = request.cookies.get(READ_PRIMARY_COOKIE)
+        try:
+            return value is not None and float(value) > time.time()
+        except ValueError:
+            return False
+
+    def stick_to_primary(self, response: Response) -> None:
+        """Route this client's reads to the primary for ``sticky_seconds``."""
+        if not self.replicas:
+            return
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            str(int(time.time()) + self.sticky_seconds),
+            max_age=self.sticky_seconds,
+            httponly=True,
+            samesite="lax",
+        )
+
+    async def check(self) -> None:
+        """Run one health check against every replica."""
+        await asyncio.gather(*(self._check(r) for r in self.replicas))
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            # A worker thread, not the request threadpool: a hung replica
+            # must not hold a request's slot
+            async with asyncio.timeout(self.check_timeout):
+                await asyncio.to_thread(self._ping, replica.engine)
+        except Exception as e:
+            if replica.healthy:
+                print(f"[REPLICA ERROR] {replica.name} marked unhealthy: {str(e)}")
+            replica.healthy = False
+            replica.last_error = str(e) or type(e).__name__
+        else:
+            replica.healthy = True
+            replica.last_error = None
+        replica.checked_at = time.time()
+
+    @staticmethod
+    def _ping(engine: Engine) -> None:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    def start(self) -> None:
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            replica.engine.dispose()
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.check_interval)
+
+    def status(self) -> List[Dict]:
+        return [
+            {
+                "name": r.name,
+                "healthy": r.healthy,
+                "last_error": r.last_error,
+                "checked_at": r.checked_at,
+            }
+            for r in self.replicas
+        ]
@@ -2,7 +2,7 @@
 Pydantic schemas for API request/response validation and serialization.
 """
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 
 
@@ -100,6 +100,16 @@ class ArticleUpdate(BaseModel):
     category_id: Optional[int] = None
 
 
+class ImageVariantResponse(BaseModel):
+    """A resized copy of an uploaded image, for building a srcset."""
+    url: str
+    width: int
+    format: str
+
+    class Config:
+        from_attributes = True
+
+
 class ArticleResponse(BaseModel):
     """Schema for article responses."""
     id: int
@@ -116,11 +126,40 @@ class ArticleResponse(BaseModel):
     updated_at: datetime
     category_id: int
     category: SearchResultCategory
+    # Resized variants per image URL in content (single-article responses only)
+    image_variants: Optional[Dict[str, List[ImageVariantResponse]]] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ArticleSummary(BaseModel):
+    """Schema for lightweight article listings (no content blocks)."""
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    is_featured: bool
+    order: int
+    category_id: int
+    category: SearchResultCategory
 
     class Config:
         from_attributes = True
 
 
+class BulkImportError(BaseModel):
+    """A line of a bulk import that was not inserted."""
+    line: int
+    error: str
+
+
+class BulkImportResult(BaseModel):
+    """Schema for the outcome of a bulk article import."""
+    inserted: int
+    errors: List[BulkImportError] = []
+
+
 # Feedback-related schemas
 class FeedbackCreate(BaseModel):
     """Schema for creating feedback/support request."""
@@ -153,3 +192,38 @@ class FeedbackUpdate(BaseModel):
     """Schema for updating feedback."""
     status: Optional[str] = None
     admin_response: Optional[str] = None
+
+
+# Multipart upload schemas
+class MultipartUploadInit(BaseModel):
+    """Schema for starting a resumable multipart upload."""
+    filename: str
+    file_type: str = "video"
+
+
+class MultipartUploadPart(BaseModel):
+    """A received part of a multipart upload."""
+    part_number: int
+    size: int
+    sha256: str
+
+
+class MultipartUploadStatus(BaseModel):
+    """Schema for multipart upload state, used to resume an upload."""
+    upload_id: str
+    filename: str
+    file_type: str
+    max_size: int
+    max_part_size: int
+    parts: List[MultipartUploadPart] = []
+
+
+class MultipartUploadPartRef(BaseModel):
+    """A part the client expects to be assembled."""
+    part_number: int
+    sha256: str
+
+
+class MultipartUploadComplete(BaseModel):
+    """Schema for completing a multipart upload."""
+    parts: Optional[List[MultipartUploadPartRef]] = None
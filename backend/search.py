@@ -0,0 +1,454 @@
+"""
+Article search backends.
+
+Handlers talk to a ``SearchBackend`` and never build search SQL themselves.
+The default ``InvertedIndexBackend`` keeps an in-process inverted index with
+BM25 scoring, so a query never scans the articles table or casts the JSON
+``content`` column to text. ``FullTextSearchBackend`` pushes the same work
+into the database (MySQL FULLTEXT or SQLite FTS5) via the ``article_search``
+shadow table created by the Alembic migrations.
+
+In-memory indexes only see the writes of their own process; with several
+workers they catch up with the others through ``ArticleVersions``.
+"""
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import String, cast, func, inspect, or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from backend.models import Article, Category
+
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Relative weight of each indexed field when computing term frequency.
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "excerpt": 2.0,
+    "block_title": 1.5,
+    "block_description": 1.0,
+}
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    """Split text into lowercase word tokens."""
+    if not value:
+        return []
+    return _TOKEN_RE.findall(value.lower())
+
+
+def article_fields(article: Article) -> Iterable[Tuple[str, str]]:
+    """Yield (field, text) pairs for every searchable part of an article."""
+    yield "title", article.title or ""
+    yield "excerpt", article.excerpt or ""
+    for block in article.content or []:
+        yield "block_title", block.get("title") or ""
+        yield "block_description", block.get("description") or ""
+
+
+def article_search_text(article: Article) -> str:
+    """Flatten an article's searchable fields into one text document."""
+    return "\n".join(value for _, value in article_fields(article) if value)
+
+
+def content_snippet(content: Optional[List[dict]], length: int = 160) -> str:
+    """Return a short plain-text snippet from the first content block."""
+    for block in content or []:
+        value = block.get("description") or block.get("title")
+        if value:
+            return value[:length]
+    return ""
+
+
+class ArticleVersions:
+    """
+    The ``updated_at`` of every article an in-memory index holds, used to
+    catch up with writes made by other worker processes.
+
+    At most every ``interval`` seconds ``catch_up`` runs one aggregate probe
+    (row count and newest ``updated_at``). Only when that differs from the
+    last probe are the ``(id, updated_at)`` pairs compared, so the index
+    reloads just the articles that were added, edited or deleted elsewhere.
+    With ``watch_categories`` the probe also covers the newest category edit,
+    and a category change elsewhere marks every article as changed.
+    """
+
+    def __init__(self, interval: Optional[float] = None, watch_categories: bool = False):
+        self.interval = interval
+        self.watch_categories = watch_categories
+        self._lock = threading.Lock()
+        self._catching_up = threading.Lock()
+        self._seen: Dict[int, Optional[datetime]] = {}
+        self._probe: Optional[Tuple] = None
+        self._checked_at = time.monotonic()
+
+    def probe(self, db: Session) -> Tuple:
+        columns = [func.count(Article.id), func.max(Article.updated_at)]
+        if self.watch_categories:
+            columns.append(select(func.max(Category.updated_at)).scalar_subquery())
+        return tuple(db.execute(select(*columns)).one())
+
+    def reset(self, probe: Tuple, articles: Iterable[Tuple[int, Optional[datetime]]]) -> None:
+        """Record a full rebuild; take ``probe`` before loading the articles."""
+        with self._lock:
+            self._probe = probe
+            self._seen = dict(articles)
+            self._checked_at = time.monotonic()
+
+    def record(self, article_id: int, updated_at: Optional[datetime]) -> None:
+        with self._lock:
+            self._seen[article_id] = updated_at
+
+    def forget(self, article_id: int) -> None:
+        with self._lock:
+            self._seen.pop(article_id, None)
+
+    def catch_up(
+        self,
+        engine: Optional[Engine],
+        apply: Callable[[Session, List[int], List[int]], None],
+    ) -> None:
+        """
+        Call ``apply(db, changed_ids, removed_ids)`` if other processes wrote
+        articles since the last check. Returns at once when the last check is
+        recent or another thread is already catching up.
+        """
+        if engine is None or self.interval is None:
+            return
+        if time.monotonic() - self._checked_at < self.interval:
+            return
+        if not self._catching_up.acquire(blocking=False):
+            return
+        try:
+            self._checked_at = time.monotonic()
+            with Session(engine) as db:
+                probe = self.probe(db)
+                if probe == self._probe:
+                    return
+                current = dict(db.query(Article.id, Article.updated_at).all())
+                categories_changed = (
+                    self.watch_categories and self._probe is not None
+                    and probe[2] != self._probe[2])
+                with self._lock:
+                    changed = [i for i, updated_at in current.items()
+                               if categories_changed or i not in self._seen
+                               or self._seen[i] != updated_at]
+                    removed = [i for i in self._seen if i not in current]
+                apply(db, changed, removed)
+            with self._lock:
+                self._probe = probe
+                for i in changed:
+                    self._seen[i] = current[i]
+                for i in removed:
+                    self._seen.pop(i, None)
+        finally:
+            self._catching_up.release()
+
+
+class SearchBackend:
+    """Interface every article search backend implements."""
+
+    def __init__(self, engine: Optional[Engine] = None):
+        self.engine = engine
+
+    def rebuild(self, db: Session) -> None:
+        """(Re)build any state the backend needs from the database."""
+
+    def index_article(self, article: Article) -> None:
+        """Add or refresh a single article after it was written."""
+
+    def remove_article(self, article_id: int) -> None:
+        """Drop a deleted article from the backend."""
+
+    def search(self, db: Session, query: str, limit: int) -> List[int]:
+        """Return matching article IDs, best match first."""
+        raise NotImplementedError
+
+
+class LikeSearchBackend(SearchBackend):
+    """Substring search with ILIKE, kept as a fallback for debugging."""
+
+    def search(self, db: Session, query: str, limit: int) -> List[int]:
+        like = f"%{query}%"
+        rows = (
+            db.query(Article.id)
+            .filter(
+                or_(
+                    Article.title.ilike(like),
+                    Article.excerpt.ilike(like),
+                    cast(Article.content, String).ilike(like),
+                )
+            )
+            .order_by(func.length(Article.title))
+            .limit(limit)
+            .all()
+        )
+        return [row.id for row in rows]
+
+
+class InvertedIndexBackend(SearchBackend):
+    """
+    In-memory inverted index over title, excerpt and content blocks.
+
+    Postings map a term to ``{article_id: weighted term frequency}``. Scoring
+    is BM25 over the weighted frequencies. The last query token is treated as
+    a prefix so results keep up with a user who is still typing. Every
+    ``refresh_interval`` seconds a search first picks up articles written by
+    other processes (see ``ArticleVersions``).
+    """
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+        refresh_interval: Optional[float] = None,
+    ):
+        super().__init__(engine)
+        self.k1 = k1
+        self.b = b
+        self.versions = ArticleVersions(refresh_interval)
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._doc_terms: Dict[int, Dict[str, float]] = {}
+        self._doc_lengths: Dict[int, float] = {}
+        self._total_length = 0.0
+        self._sorted_terms: Optional[List[str]] = None
+
+    def rebuild(self, db: Session) -> None:
+        probe = self.versions.probe(db)
+        articles = db.query(Article).all()
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._doc_terms = {}
+            self._doc_lengths = {}
+            self._total_length = 0.0
+            self._sorted_terms = None
+            for article in articles:
+                self._add(article)
+        self.versions.reset(probe, ((a.id, a.updated_at) for a in articles))
+
+    def index_article(self, article: Article) -> None:
+        with self._lock:
+            self._remove(article.id)
+            self._add(article)
+        self.versions.record(article.id, article.updated_at)
+
+    def remove_article(self, article_id: int) -> None:
+        with self._lock:
+            self._remove(article_id)
+        self.versions.forget(article_id)
+
+    def refresh(self) -> None:
+        """Pick up articles written by other processes, if it is time to check."""
+        self.versions.catch_up(self.engine, self._apply_changes)
+
+    def _apply_changes(self, db: Session, changed: List[int], removed: List[int]) -> None:
+        articles = db.query(Article).filter(Article.id.in_(changed)).all() if changed else []
+        with self._lock:
+            for article_id in removed:
+                self._remove(article_id)
+            for article in articles:
+                self._remove(article.id)
+                self._add(article)
+
+    def search(self, db: Session, query: str, limit: int) -> List[int]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        self.refresh()
+        with self._lock:
+            n_docs = len(self._doc_lengths)
+            if n_docs == 0:
+                return []
+            avg_length = self._total_length / n_docs
+
+            scores: Dict[int, float] = defaultdict(float)
+            *exact, last = tokens
+            for term in exact:
+                self._score_term(term, n_docs, avg_length, scores)
+            # Prefix-expand the last token; an exact hit also matches itself.
+            for term in self._expand_prefix(last):
+                self._score_term(term, n_docs, avg_length, scores)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [article_id for article_id, _ in ranked[:limit]]
+
+    # Internal helpers -- callers must hold ``self._lock``.
+
+    def _add(self, article: Article) -> None:
+        terms: Counter = Counter()
+        for field, value in article_fields(article):
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(value):
+                terms[token] += weight
+
+        length = sum(terms.values())
+        self._doc_terms[article.id] = dict(terms)
+        self._doc_lengths[article.id] = length
+        self._total_length += length
+        for term, tf in terms.items():
+            if term not in self._postings:
+                self._sorted_terms = None
+            self._postings[term][article.id] = tf
+
+    def _remove(self, article_id: int) -> None:
+        terms = self._doc_terms.pop(article_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._doc_lengths.pop(article_id)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(article_id, None)
+            if not postings:
+                del self._postings[term]
+                self._sorted_terms = None
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        terms = self._sorted_terms
+        start = bisect_left(terms, prefix)
+        matches = []
+        for term in terms[start:]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
+
+    def _score_term(
+        self,
+        term: str,
+        n_docs: int,
+        avg_length: float,
+        scores: Dict[int, float],
+    ) -> None:
+        postings = self._postings.get(term)
+        if not postings:
+            return
+        df = len(postings)
+        idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        for article_id, tf in postings.items():
+            norm = 1 - self.b + self.b * self._doc_lengths[article_id] / avg_length
+            scores[article_id] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+
+
+class FullTextSearchBackend(SearchBackend):
+    """
+    Database-native full-text search over the ``article_search`` table.
+
+    The table holds one flattened text document per article and is indexed
+    with a FULLTEXT index on MySQL or is an FTS5 virtual table on SQLite, so
+    ranking happens inside the database. Run ``alembic upgrade head`` to
+    create it and ``python -m backend.reindex`` to backfill it.
+    """
+
+    TABLE = "article_search"
+
+    def rebuild(self, db: Session) -> None:
+        dialect = self.engine.dialect.name
+        if dialect not in ("mysql", "sqlite"):
+            raise RuntimeError(
+                f"Full-text search is not supported on '{dialect}'")
+        if not inspect(self.engine).has_table(self.TABLE):
+            raise RuntimeError(
+                f"Table '{self.TABLE}' is missing; run 'alembic upgrade head' "
+                "and 'python -m backend.reindex' first")
+
+    def backfill(self, db: Session, batch_size: int = 500) -> int:
+        """Rewrite the search document of every article. Returns the count."""
+        count = 0
+        conn = db.connection()
+        conn.execute(text(f"DELETE FROM {self.TABLE}"))
+        query = db.query(Article).order_by(Article.id)
+        for article in query.yield_per(batch_size):
+            self._insert(conn, article.id, article_search_text(article))
+            count += 1
+        db.commit()
+        return count
+
+    def index_article(self, article: Article) -> None:
+        body = article_search_text(article)
+        with self.engine.begin() as conn:
+            self._delete(conn, article.id)
+            self._insert(conn, article.id, body)
+
+    def remove_article(self, article_id: int) -> None:
+        with self.engine.begin() as conn:
+            self._delete(conn, article_id)
+
+    def search(self, db: Session, query: str, limit: int) -> List[int]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        if self.engine.dialect.name == "mysql":
+            # Boolean mode so the last token can be matched as a prefix
+            match = " ".join(tokens) + "*"
+            sql = text(
+                f"SELECT article_id FROM {self.TABLE} "
+                "WHERE MATCH(body) AGAINST (:q IN BOOLEAN MODE) "
+                "ORDER BY MATCH(body) AGAINST (:q IN BOOLEAN MODE) DESC "
+                "LIMIT :limit"
+            )
+        else:
+            *exact, last = tokens
+            match = " OR ".join(
+                [f'"{t}"' for t in exact] + [f'"{last}"*'])
+            sql = text(
+                f"SELECT rowid AS article_id FROM {self.TABLE} "
+                f"WHERE {self.TABLE} MATCH :q "
+                f"ORDER BY bm25({self.TABLE}) LIMIT :limit"
+            )
+
+        rows = db.execute(sql, {"q": match, "limit": limit}).all()
+        return [row.article_id for row in rows]
+
+    def _insert(self, conn, article_id: int, body: str) -> None:
+        if conn.dialect.name == "mysql":
+            sql = f"INSERT INTO {self.TABLE} (article_id, body) VALUES (:id, :body)"
+        else:
+            sql = f"INSERT INTO {self.TABLE} (rowid, body) VALUES (:id, :body)"
+        conn.execute(text(sql), {"id": article_id, "body": body})
+
+    def _delete(self, conn, article_id: int) -> None:
+        key = "article_id" if conn.dialect.name == "mysql" else "rowid"
+        conn.execute(
+            text(f"DELETE FROM {self.TABLE} WHERE {key} = :id"),
+            {"id": article_id},
+        )
+
+
+SEARCH_BACKENDS = {
+    "index": InvertedIndexBackend,
+    "like": LikeSearchBackend,
+    "fulltext": FullTextSearchBackend,
+}
+
+
+def create_search_backend(name: str, engine: Engine, refresh_interval: Optional[float] = None) -> SearchBackend:
+    """
+    Instantiate the search backend configured by ``name``. ``refresh_interval``
+    applies to the in-memory index, which must catch up with other processes.
+    """
+    try:
+        backend_class = SEARCH_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown search backend '{name}'. "
+            f"Choose one of: {', '.join(SEARCH_BACKENDS)}"
+        )
+    if backend_class is InvertedIndexBackend:
+        return backend_class(engine, refresh_interval=refresh_interval)
+    return backend_class(engine)
@@ -1,17 +1,25 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from backend.models import Base, Category, Article
+from backend.database import engine_options, sync_database_url
+from backend.models import Category, Article
 from backend.settings import get_settings
 
 
+def migrate():
+    """Bring the schema up to date, like ``alembic upgrade head``."""
+    command.upgrade(Config(str(Path(__file__).with_name("alembic.ini"))), "head")
+
+
 def seed():
     settings = get_settings()
-    db_url = settings.database_url
-    if db_url.startswith("mysql://") and "+pymysql" not in db_url:
-        db_url = db_url.replace("mysql://", "mysql+pymysql://")
-    engine = create_engine(db_url, pool_pre_ping=True)
-    Base.metadata.create_all(bind=engine)
+    migrate()
+    engine = create_engine(sync_database_url(settings.database_url),
+                           **engine_options(settings, pool_size=1))
     SessionLocal = sessionmaker(bind=engine)
 
     with SessionLocal() as db:
@@ -0,0 +1,138 @@
+"""
+Direct row-to-JSON serialization for article responses.
+
+For a handler's return value FastAPI validates every object against the
+route's ``response_model`` and then encodes it with ``jsonable_encoder`` and
+the stdlib encoder, so a response built from ``ArticleResponse`` objects goes
+through Pydantic twice. ``ArticleMapper`` builds the same payloads as plain
+dicts straight from ORM rows (same keys in the same order, with the defaults
+Pydantic would fill in), and read handlers return them as an
+``ORJSONResponse``, which FastAPI passes through untouched. The output is
+byte-identical to the validated path; ``response_model`` stays on the route
+for the OpenAPI schema.
+
+The content blocks are the expensive part. They are validated for a whole
+batch of rows with one ``TypeAdapter`` call and cached per ``(id,
+updated_at)``, so listing unchanged articles again reuses the earlier result.
+Writes call ``invalidate`` as well, since two edits within the same second
+can share an ``updated_at``.
+
+Datetimes are left for orjson, which formats naive values exactly as
+Pydantic does.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from backend.models import Article, Category
+from backend.schemas import ContentBlock
+
+_content_batch = TypeAdapter(List[Optional[List[ContentBlock]]])
+
+
+class ArticleMapper:
+    """Converts ``Article`` rows to ``ArticleResponse`` payloads."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._content: "OrderedDict[Tuple, Optional[List[Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def to_dict(
+        self,
+        article: Article,
+        category: Optional[Category] = None,
+        view_count: Optional[int] = None,
+        image_variants: Optional[Dict[str, List[Dict]]] = None,
+    ) -> Dict:
+        """
+        One payload. ``category`` is needed when ``article.category`` is not
+        loaded; ``view_count`` overrides the stored count.
+        """
+        payload = _payload(
+            article, self._contents([article])[0], category or article.category)
+        if view_count is not None:
+            payload["view_count"] = view_count
+        payload["image_variants"] = image_variants
+        return payload
+
+    def to_dicts(self, articles: Iterable[Article]) -> List[Dict]:
+        """Payloads for ``articles`` (categories loaded), in order."""
+        articles = list(articles)
+        return [
+            _payload(article, content, article.category)
+            for article, content in zip(articles, self._contents(articles))
+        ]
+
+    def invalidate(self, article_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._content if key[0] == article_id]:
+                del self._content[key]
+
+    def _contents(self, articles: List[Article]) -> List[Optional[List[Dict]]]:
+        keys = [(article.id, article.updated_at) for article in articles]
+        contents: List = [None] * len(articles)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in self._content:
+                    self._content.move_to_end(key)
+                    contents[i] = self._content[key]
+                else:
+                    missing.append(i)
+            self.hits += len(articles) - len(missing)
+            self.misses += len(missing)
+        if not missing:
+            return contents
+
+        validated = _content_batch.dump_python(_content_batch.validate_python(
+            [articles[i].content or None for i in missing]))
+        with self._lock:
+            for i, content in zip(missing, validated):
+                contents[i] = content
+                if keys[i][0] is not None:
+                    self._content[keys[i]] = content
+            while len(self._content) > self.max_entries:
+                self._content.popitem(last=False)
+        return contents
+
+
+def _payload(article: Article, content: Optional[List[Dict]], category: Category) -> Dict:
+    return {
+        "id": article.id,
+        "title": article.title,
+        "slug": article.slug,
+        "excerpt": article.excerpt,
+        "content": content,
+        "url": article.url,
+        "is_published": bool(article.is_published),
+        "is_featured": bool(article.is_featured),
+        "view_count": article.view_count,
+        "order": article.order,
+        "created_at": article.created_at,
+        "updated_at": article.updated_at,
+        "category_id": article.category_id,
+        "category": {"name": category.name, "color": category.color},
+        "image_variants": None,
+    }
+
+
+def article_summary_dict(article: Article) -> Dict:
+    """An ``ArticleSummary`` payload for ``article`` (category loaded)."""
+    return {
+        "id": article.id,
+        "title": article.title,
+        "slug": article.slug,
+        "excerpt": article.excerpt,
+        "is_featured": bool(article.is_featured),
+        "order": article.order,
+        "category_id": article.category_id,
+        "category": {
+            "name": article.category.name,
+            "color": article.category.color,
+        },
+    }
@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from functools import lru_cache
 from typing import List
 import os
 from pathlib import Path
@@ -16,6 +17,38 @@ class Settings(BaseSettings):
         "DATABASE_URL"
     )
 
+    # Read replicas (comma separated, same form as DATABASE_URL). Read-only
+    # GET handlers use them round-robin; a replica failing its health check
+    # (every REPLICA_CHECK_INTERVAL seconds) is skipped until it recovers.
+    # After a write, that client reads from the primary for
+    # READ_YOUR_WRITES_SECONDS so it never sees its own change missing
+    database_replicas: List[str] = [
+        url.strip()
+        for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+        if url.strip()
+    ]
+    replica_check_interval: float = float(
+        os.getenv("REPLICA_CHECK_INTERVAL", "5"))
+    read_your_writes_seconds: int = int(
+        os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+
+    # Connection pool settings
+    # Request handler pool: persistent connections, extra connections allowed
+    # under bursts, and seconds to wait for a free one before failing
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    # Background workers and scripts use a separate, smaller pool
+    db_worker_pool_size: int = int(os.getenv("DB_WORKER_POOL_SIZE", "5"))
+    # Connections older than this (seconds) are replaced on checkout; keep it
+    # below the server's wait_timeout
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # "optimistic": rely on DB_POOL_RECYCLE and discard connections that fail
+    # in use; "pessimistic": ping every connection on checkout (one extra
+    # round trip per checkout)
+    db_disconnect_strategy: str = os.getenv(
+        "DB_DISCONNECT_STRATEGY", "optimistic")
+
     cors_origins: List[str] = [
         os.getenv("CORS_ORIGIN", "http://localhost:8080"),
         os.getenv("CORS_ORIGIN_ALT", "http://127.0.0.1:8080"),
@@ -31,7 +64,59 @@ class Settings(BaseSettings):
     smtp_from_name: str = os.getenv("SMTP_FROM_NAME")
     frontend_url: str = os.getenv("FRONTEND_URL")
     enable_email: bool = os.getenv("ENABLE_EMAIL", "false").lower() == "true"
+    smtp_use_tls: bool = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
+    # Logged-in SMTP sessions kept open for reuse
+    smtp_pool_size: int = int(os.getenv("SMTP_POOL_SIZE", "4"))
+    # Background outbox delivery: worker threads, idle poll interval (seconds),
+    # attempts before giving up and the first retry delay (doubles each time)
+    email_workers: int = int(os.getenv("EMAIL_WORKERS", "2"))
+    email_poll_interval: float = float(os.getenv("EMAIL_POLL_INTERVAL", "5"))
+    email_max_attempts: int = int(os.getenv("EMAIL_MAX_ATTEMPTS", "6"))
+    email_retry_backoff: float = float(os.getenv("EMAIL_RETRY_BACKOFF", "30"))
+
+    # Search settings
+    # "index" (in-process inverted index), "fulltext" (MySQL FULLTEXT /
+    # SQLite FTS5, see migrations/) or "like" (ILIKE table scan)
+    search_backend: str = os.getenv("SEARCH_BACKEND", "index")
+    # Seconds between checks of the in-memory index for articles written by
+    # other worker processes (one aggregate query; changed rows are reloaded)
+    search_refresh_interval: float = float(
+        os.getenv("SEARCH_REFRESH_INTERVAL", "5"))
+
+    # Cache settings
+    # Upper bound (seconds) on how long a cached GET /api/categories response
+    # is served; local writes invalidate it immediately
+    categories_cache_ttl: float = float(os.getenv("CATEGORIES_CACHE_TTL", "60"))
+    # Cache-Control sent with ETagged article and category responses
+    http_cache_control: str = os.getenv("HTTP_CACHE_CONTROL", "no-cache")
+
+    # Upload settings (bytes)
+    max_image_upload_size: int = int(
+        os.getenv("MAX_IMAGE_UPLOAD_SIZE", str(20 * 1024 * 1024)))
+    max_video_upload_size: int = int(
+        os.getenv("MAX_VIDEO_UPLOAD_SIZE", str(1024 * 1024 * 1024)))
+    max_upload_part_size: int = int(
+        os.getenv("MAX_UPLOAD_PART_SIZE", str(64 * 1024 * 1024)))
+    # Processes generating resized WebP/AVIF image variants (0 disables)
+    image_workers: int = int(os.getenv("IMAGE_WORKERS", "2"))
+    # Garbage collection (python -m backend.upload_gc): an unused upload is
+    # deleted once it has been unreferenced for this long; multipart uploads
+    # with no new parts for MULTIPART_UPLOAD_TTL_HOURS are discarded
+    upload_gc_grace_hours: float = float(os.getenv("UPLOAD_GC_GRACE_HOURS", "24"))
+    multipart_upload_ttl_hours: float = float(
+        os.getenv("MULTIPART_UPLOAD_TTL_HOURS", "48"))
+
+    # View counter settings
+    # Article views are buffered in memory and written every
+    # VIEW_COUNT_FLUSH_INTERVAL seconds or after VIEW_COUNT_FLUSH_THRESHOLD
+    # views, whichever comes first (the durability window on a crash)
+    view_count_flush_interval: float = float(
+        os.getenv("VIEW_COUNT_FLUSH_INTERVAL", "5"))
+    view_count_flush_threshold: int = int(
+        os.getenv("VIEW_COUNT_FLUSH_THRESHOLD", "1000"))
 
 
+@lru_cache
 def get_settings() -> Settings:
+    """Return the process-wide settings, read from the environment once."""
     return Settings()
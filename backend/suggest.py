@@ -0,0 +1,213 @@
+"""
+In-memory prefix index for type-ahead suggestions.
+
+Every article contributes sorted keys for each word position of its title,
+its slug and its category name. A lookup is a ``bisect`` into that sorted
+array followed by a short forward scan, so answering a keystroke never
+touches the database. A write inserts or removes just that article's keys,
+also with ``bisect``, instead of reloading the corpus.
+"""
+import re
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, joinedload, load_only
+
+from backend.models import Article, Category
+from backend.schemas import SearchResult, SearchResultCategory
+from backend.search import ArticleVersions, content_snippet
+
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Lower rank wins when one article matches through several keys.
+RANK_TITLE = 0
+RANK_SLUG = 1
+RANK_CATEGORY = 2
+RELEVANCE = {RANK_TITLE: "high", RANK_SLUG: "medium", RANK_CATEGORY: "low"}
+
+# Above this many changed articles, re-sorting every key beats inserting
+# them one by one
+BULK_CHANGES = 64
+
+
+def _normalize(value: str) -> str:
+    return " ".join(_WORD_RE.findall(value.lower()))
+
+
+def _word_suffixes(value: str) -> List[str]:
+    """'Getting Started Guide' -> ['getting started guide', 'started guide', 'guide']."""
+    words = _WORD_RE.findall(value.lower())
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+def _keys(result: SearchResult) -> List[Tuple[str, int, int]]:
+    """The (key, rank, article_id) entries of one article."""
+    keys = [(key, RANK_TITLE, result.id) for key in _word_suffixes(result.title or "")]
+    slug = _normalize(result.slug or "")
+    if slug:
+        keys.append((slug, RANK_SLUG, result.id))
+    keys.extend(
+        (key, RANK_CATEGORY, result.id) for key in _word_suffixes(result.category.name or ""))
+    return keys
+
+
+def _result(article: Article, category: Category, excerpt: Optional[str]) -> SearchResult:
+    return SearchResult(
+        id=article.id,
+        title=article.title,
+        excerpt=excerpt or "",
+        slug=article.slug,
+        url=article.url,
+        category=SearchResultCategory(name=category.name, color=category.color),
+        relevance="low",
+    )
+
+
+def _load(db: Session, ids: Optional[List[int]] = None) -> List[Tuple[Article, SearchResult]]:
+    """
+    Articles (all, or ``ids``) with their suggestion results. Only the
+    columns a suggestion shows are loaded; ``content`` is read just for the
+    articles without an excerpt, which fall back to a content snippet.
+    """
+    query = db.query(Article).options(
+        load_only(Article.id, Article.title, Article.slug, Article.excerpt,
+                  Article.url, Article.updated_at, Article.category_id),
+        joinedload(Article.category).load_only(Category.name, Category.color),
+    )
+    if ids is not None:
+        query = query.filter(Article.id.in_(ids))
+    articles = query.all()
+
+    missing = [a.id for a in articles if not a.excerpt]
+    snippets = {}
+    if missing:
+        snippets = {
+            article_id: content_snippet(content)
+            for article_id, content in db.query(Article.id, Article.content)
+            .filter(Article.id.in_(missing))
+        }
+    return [
+        (a, _result(a, a.category, a.excerpt or snippets.get(a.id)))
+        for a in articles
+    ]
+
+
+class SuggestIndex:
+    """
+    Sorted-array prefix index over article titles, slugs and categories.
+
+    Every ``refresh_interval`` seconds a lookup first picks up articles and
+    categories written by other processes (see ``search.ArticleVersions``).
+    """
+
+    def __init__(self, engine: Optional[Engine] = None, refresh_interval: Optional[float] = None):
+        self.engine = engine
+        self.versions = ArticleVersions(refresh_interval, watch_categories=True)
+        self._lock = threading.Lock()
+        self._keys: List[Tuple[str, int, int]] = []  # sorted (key, rank, article_id)
+        self._results: Dict[int, SearchResult] = {}
+        self._categories: Dict[int, int] = {}  # article_id -> category_id
+
+    def rebuild(self, db: Session) -> None:
+        """Reload every article and swap in a freshly built index."""
+        probe = self.versions.probe(db)
+        loaded = _load(db)
+        results = {article.id: result for article, result in loaded}
+        keys = sorted(key for result in results.values() for key in _keys(result))
+        with self._lock:
+            self._keys, self._results = keys, results
+            self._categories = {article.id: article.category_id for article, _ in loaded}
+        self.versions.reset(probe, ((article.id, article.updated_at) for article, _ in loaded))
+
+    def upsert(self, article: Article, category: Category) -> None:
+        """Add or refresh one article after it was written."""
+        excerpt = article.excerpt or content_snippet(article.content)
+        with self._lock:
+            self._put([(article.category_id, _result(article, category, excerpt))])
+        self.versions.record(article.id, article.updated_at)
+
+    def remove(self, article_id: int) -> None:
+        """Drop a deleted article."""
+        with self._lock:
+            self._drop(article_id)
+        self.versions.forget(article_id)
+
+    def update_category(self, category: Category) -> None:
+        """Re-key the articles of a renamed or recoloured category."""
+        updated = SearchResultCategory(name=category.name, color=category.color)
+        with self._lock:
+            self._put([
+                (category_id, self._results[article_id].model_copy(update={"category": updated}))
+                for article_id, category_id in self._categories.items()
+                if category_id == category.id
+            ])
+
+    def refresh(self) -> None:
+        """Pick up articles written by other processes, if it is time to check."""
+        self.versions.catch_up(self.engine, self._apply_changes)
+
+    def suggest(self, query: str, limit: int) -> List[SearchResult]:
+        """Return up to ``limit`` articles with a key starting with ``query``."""
+        prefix = _normalize(query)
+        if not prefix:
+            return []
+
+        self.refresh()
+        best: Dict[int, int] = {}
+        with self._lock:
+            keys = self._keys
+            for i in range(bisect_left(keys, (prefix,)), len(keys)):
+                key, rank, article_id = keys[i]
+                if not key.startswith(prefix):
+                    break
+                if rank < best.get(article_id, len(RELEVANCE)):
+                    best[article_id] = rank
+            results = {article_id: self._results[article_id] for article_id in best}
+
+        ranked = sorted(
+            best.items(),
+            key=lambda item: (item[1], len(results[item[0]].title), item[0]),
+        )
+        return [
+            results[article_id].model_copy(
+                update={"relevance": RELEVANCE[rank]})
+            for article_id, rank in ranked[:limit]
+        ]
+
+    def _apply_changes(self, db: Session, changed: List[int], removed: List[int]) -> None:
+        loaded = _load(db, changed) if changed else []
+        with self._lock:
+            for article_id in removed:
+                self._drop(article_id)
+            self._put((article.category_id, result) for article, result in loaded)
+
+    # Internal helpers -- callers must hold ``self._lock``.
+
+    def _drop(self, article_id: int) -> None:
+        result = self._results.pop(article_id, None)
+        self._categories.pop(article_id, None)
+        if result is None:
+            return
+        for key in _keys(result):
+            i = bisect_left(self._keys, key)
+            if i < len(self._keys) and self._keys[i] == key:
+                del self._keys[i]
+
+    def _put(self, entries: Iterable[Tuple[int, SearchResult]]) -> None:
+        entries = list(entries)
+        if len(entries) > BULK_CHANGES:
+            for category_id, result in entries:
+                self._results[result.id] = result
+                self._categories[result.id] = category_id
+            self._keys = sorted(
+                key for result in self._results.values() for key in _keys(result))
+            return
+        for category_id, result in entries:
+            self._drop(result.id)
+            self._results[result.id] = result
+            self._categories[result.id] = category_id
+            for key in _keys(result):
+                insort(self._keys, key)
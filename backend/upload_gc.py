@@ -0,0 +1,268 @@
+"""
+Garbage collection for uploaded files.
+
+Deleting an article (or replacing an image in its content) leaves the file
+behind in ``backend/uploads``. ``UploadGarbageCollector`` removes files that
+no article uses any more, with a mark-and-sweep over two runs:
+
+1. Build the set of referenced URLs by streaming ``Article.content`` in
+   batches (``yield_per``), so memory holds one batch of articles plus the
+   URL set, never every article at once. Variants of referenced images
+   count as referenced too.
+2. Walk the upload directory. An unreferenced file is *marked* the first
+   time it is seen and only *swept* on a later run once it has stayed
+   unreferenced for the grace period. Files modified within the grace
+   period are never touched, which covers uploads whose article has not
+   been saved yet (deduplicated uploads and hash lookups refresh the mtime).
+   Right before deleting, ``upload_references`` is checked again for
+   articles saved while the scan was running.
+
+Marks are kept in a small JSON file next to the partial uploads. The same
+run also removes abandoned multipart sessions and partial files, image
+variant rows of deleted files and references left by deleted articles.
+
+    python -m backend.upload_gc [--dry-run]
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Set, Tuple
+
+from sqlalchemy import create_engine, delete, exists, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.database import engine_options, sync_database_url
+from backend.models import Article, ImageVariant, UploadReference
+from backend.settings import get_settings
+from backend.uploads import (
+    MULTIPART_DIR,
+    UPLOAD_DIR,
+    UPLOAD_TMP_DIR,
+    content_upload_urls,
+)
+
+
+class CollectionStats(NamedTuple):
+    scanned: int
+    referenced: int
+    marked: int
+    deleted: int
+    freed_bytes: int
+    stale_sessions: int
+
+
+class UploadGarbageCollector:
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        upload_dir: Path = UPLOAD_DIR,
+        tmp_dir: Path = UPLOAD_TMP_DIR,
+        grace_seconds: float = 24 * 3600,
+        multipart_ttl_seconds: float = 48 * 3600,
+        batch_size: int = 500,
+    ):
+        self.session_factory = session_factory
+        self.upload_dir = upload_dir
+        self.tmp_dir = tmp_dir
+        self.multipart_dir = tmp_dir / MULTIPART_DIR.name
+        self.marks_path = tmp_dir / "gc_marks.json"
+        self.grace_seconds = grace_seconds
+        self.multipart_ttl_seconds = multipart_ttl_seconds
+        self.batch_size = batch_size
+
+    def run(self, dry_run: bool = False) -> CollectionStats:
+        now = time.time()
+        with self.session_factory() as db:
+            referenced = self.referenced_urls(db)
+
+        marks = self._load_marks()
+        new_marks: Dict[str, float] = {}
+        due: List[Tuple[str, Path, int]] = []
+        scanned = 0
+        for url, path, stat in self._walk():
+            scanned += 1
+            if url in referenced or now - stat.st_mtime < self.grace_seconds:
+                continue
+            marked_at = marks.get(url, now)
+            if now - marked_at >= self.grace_seconds:
+                due.append((url, path, stat.st_size))
+            else:
+                new_marks[url] = marked_at
+
+        deleted, freed = 0, 0
+        if not dry_run:
+            with self.session_factory() as db:
+                # References of deleted articles must not keep their files
+                self._prune_references(db)
+                for start in range(0, len(due), self.batch_size):
+                    batch = due[start:start + self.batch_size]
+                    d, f, kept = self._sweep(db, batch)
+                    deleted += d
+                    freed += f
+                    new_marks.update((url, marks[url]) for url in kept)
+                db.commit()
+            self._save_marks(new_marks)
+            stale_sessions = self._remove_stale_partials(now)
+        else:
+            deleted = len(due)
+            freed = sum(size for _, _, size in due)
+            stale_sessions = 0
+
+        return CollectionStats(
+            scanned=scanned,
+            referenced=len(referenced),
+            marked=len(new_marks),
+            deleted=deleted,
+            freed_bytes=freed,
+            stale_sessions=stale_sessions,
+        )
+
+    def referenced_urls(self, db: Session) -> Set[str]:
+        """Every upload URL used by an article, streamed ``batch_size`` rows at a time."""
+        urls: Set[str] = set()
+        rows = db.execute(
+            select(Article.content, Article.url)
+            .execution_options(yield_per=self.batch_size)
+        )
+        for content, article_url in rows:
+            urls.update(content_upload_urls(content))
+            if article_url and article_url.startswith("/uploads/"):
+                urls.add(article_url)
+
+        variants = db.execute(
+            select(ImageVariant.source_url, ImageVariant.url)
+            .execution_options(yield_per=self.batch_size)
+        )
+        for source_url, url in variants:
+            if source_url in urls:
+                urls.add(url)
+        return urls
+
+    def _walk(self) -> Iterator[Tuple[str, Path, os.stat_result]]:
+        base = self.upload_dir.resolve()
+        for root, _dirs, files in os.walk(base):
+            for name in files:
+                path = Path(root) / name
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                yield f"/uploads/{path.relative_to(base).as_posix()}", path, stat
+
+    def _sweep(self, db: Session, batch: List[Tuple[str, Path, int]]) -> Tuple[int, int, List[str]]:
+        """Delete a batch of due files unless an article started using them meanwhile."""
+        in_use = set()
+        for row in (
+            db.query(UploadReference.url)
+            .filter(UploadReference.url.in_([url for url, _, _ in batch]))
+            .distinct()
+        ):
+            in_use.add(row.url)
+
+        deleted, freed, kept, removed = 0, 0, [], []
+        for url, path, size in batch:
+            if url in in_use:
+                continue
+            try:
+                if time.time() - path.stat().st_mtime < self.grace_seconds:
+                    # Handed out again since the walk
+                    kept.append(url)
+                    continue
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"[UPLOAD GC ERROR] Failed to delete {url}: {str(e)}")
+                kept.append(url)
+                continue
+            removed.append(url)
+            deleted += 1
+            freed += size
+
+        if removed:
+            db.execute(
+                delete(ImageVariant)
+                .where(ImageVariant.source_url.in_(removed) | ImageVariant.url.in_(removed))
+                .execution_options(synchronize_session=False)
+            )
+        return deleted, freed, kept
+
+    def _prune_references(self, db: Session) -> None:
+        """Drop reference rows of articles that no longer exist."""
+        db.execute(
+            delete(UploadReference)
+            .where(~exists().where(Article.id == UploadReference.article_id))
+            .execution_options(synchronize_session=False)
+        )
+
+    def _remove_stale_partials(self, now: float) -> int:
+        """Remove multipart sessions and partial files nobody has written to for a while."""
+        cutoff = now - self.multipart_ttl_seconds
+        removed = 0
+        if self.multipart_dir.is_dir():
+            for session_dir in self.multipart_dir.iterdir():
+                if not session_dir.is_dir():
+                    continue
+                try:
+                    newest = max(
+                        [session_dir.stat().st_mtime]
+                        + [p.stat().st_mtime for p in session_dir.iterdir()])
+                except FileNotFoundError:
+                    continue
+                if newest < cutoff:
+                    shutil.rmtree(session_dir, ignore_errors=True)
+                    removed += 1
+
+        if self.tmp_dir.is_dir():
+            for path in self.tmp_dir.glob("*.part"):
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                except FileNotFoundError:
+                    pass
+        return removed
+
+    def _load_marks(self) -> Dict[str, float]:
+        try:
+            return json.loads(self.marks_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_marks(self, marks: Dict[str, float]) -> None:
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.marks_path.with_name(f".{self.marks_path.name}.tmp")
+        tmp.write_text(json.dumps(marks))
+        tmp.replace(self.marks_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove uploaded files no article uses")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report what would be deleted without changing anything")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    engine = create_engine(sync_database_url(settings.database_url),
+                           **engine_options(settings, pool_size=1))
+    SessionLocal = sessionmaker(bind=engine)
+
+    collector = UploadGarbageCollector(
+        SessionLocal,
+        grace_seconds=settings.upload_gc_grace_hours * 3600,
+        multipart_ttl_seconds=settings.multipart_upload_ttl_hours * 3600,
+    )
+    stats = collector.run(dry_run=args.dry_run)
+    verb = "Would delete" if args.dry_run else "Deleted"
+    print(
+        f"Scanned {stats.scanned} file(s), {stats.referenced} referenced URL(s); "
+        f"{verb} {stats.deleted} file(s) ({stats.freed_bytes} bytes), "
+        f"{stats.marked} marked for a later run, "
+        f"{stats.stale_sessions} stale multipart session(s) removed"
+    )
+
+
+if __name__ == "__main__":
+    main()
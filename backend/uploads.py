@@ -0,0 +1,576 @@
+"""
+Upload storage helpers.
+
+Uploads are streamed to a temporary file in fixed-size chunks (file writes
+run in the threadpool so the event loop never blocks on disk) and then
+atomically renamed into place, so memory per upload stays constant and a
+half-written file is never visible under ``/uploads``.
+
+The store is content addressed: a file is hashed (SHA-256) while it streams
+and lands at ``/uploads/<type>s/<sha[:2]>/<sha><ext>``. Uploading the same
+bytes twice yields the same URL and a single copy on disk, and since a path
+never changes meaning its responses can be cached forever.
+
+Form uploads are parsed from the raw request stream (``FormFileStream``)
+rather than through ``UploadFile``, which Starlette spools completely before
+the handler runs: the size limit stops an upload mid-body, and accepted
+bytes are written once, straight into the store.
+
+Large files can also be sent in parts through ``MultipartUploadStore``: each
+part is streamed to its own file in a per-upload session directory, so
+parts may arrive in parallel and a dropped connection only costs one part.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from fastapi.staticfiles import StaticFiles
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+from backend.models import Article, UploadReference
+
+
+UPLOAD_DIR = Path("backend/uploads")
+# Partial files live outside the served directory, on the same filesystem
+UPLOAD_TMP_DIR = Path("backend/upload_tmp")
+MULTIPART_DIR = UPLOAD_TMP_DIR / "multipart"
+
+ALLOWED_EXTENSIONS = {
+    "image": {".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg"},
+    "video": {".mp4", ".webm", ".ogg", ".mov", ".avi"},
+}
+
+CHUNK_SIZE = 1024 * 1024
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class StoredUpload(NamedTuple):
+    url: str
+    size: int
+    sha256: str
+    # True if identical content was already stored
+    deduplicated: bool
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds its configured maximum size."""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"File exceeds the maximum size of {max_size} bytes")
+        self.max_size = max_size
+
+
+class MalformedUpload(Exception):
+    """Raised when a form upload body is not multipart or lacks its file field."""
+
+
+class FormFileStream:
+    """
+    One file field of a multipart/form-data body, parsed as the body arrives.
+
+    python-multipart's push parser is fed the request stream chunk by chunk;
+    ``open`` reads up to the file's part headers and returns its filename,
+    then ``chunks`` yields the file's bytes as they are received. The rest
+    of the body is never read.
+    """
+
+    def __init__(self, stream: AsyncIterator[bytes], content_type: str, field: str = "file"):
+        media_type, params = parse_options_header(content_type)
+        boundary = params.get(b"boundary")
+        if media_type != b"multipart/form-data" or not boundary:
+            raise MalformedUpload("Expected a multipart/form-data body")
+        self.field = field.encode()
+        self.filename: Optional[str] = None
+        self._stream = stream.__aiter__()
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._in_file = False
+        self._file_done = False
+        self._pending: List[bytes] = []
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    async def open(self) -> str:
+        """Read up to the file field's headers and return its filename."""
+        while self.filename is None:
+            if not await self._feed():
+                raise MalformedUpload(f"Missing '{self.field.decode()}' file field")
+        return self.filename
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """The file's bytes, one chunk per chunk of request body."""
+        while True:
+            if self._pending:
+                data, self._pending = b"".join(self._pending), []
+                yield data
+            if self._file_done:
+                return
+            if not await self._feed():
+                raise MalformedUpload("Request body ended inside the file")
+
+    async def _feed(self) -> bool:
+        try:
+            chunk = await self._stream.__anext__()
+        except StopAsyncIteration:
+            chunk = None
+        try:
+            if chunk is None:
+                self._parser.finalize()
+                return False
+            self._parser.write(chunk)
+        except MultipartParseError as e:
+            raise MalformedUpload(f"Malformed multipart body: {e}")
+        return True
+
+    # Parser callbacks
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if (self.filename is None and options.get(b"name") == self.field
+                and b"filename" in options):
+            self.filename = options[b"filename"].decode("utf-8", "replace")
+            self._in_file = True
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self._pending.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        if self._in_file:
+            self._in_file = False
+            self._file_done = True
+
+
+def ensure_upload_dirs() -> None:
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    for file_type in ALLOWED_EXTENSIONS:
+        (UPLOAD_DIR / f"{file_type}s").mkdir(exist_ok=True)
+    UPLOAD_TMP_DIR.mkdir(parents=True, exist_ok=True)
+    MULTIPART_DIR.mkdir(exist_ok=True)
+
+
+def content_path(file_type: str, sha256: str, extension: str) -> Path:
+    return UPLOAD_DIR / f"{file_type}s" / sha256[:2] / f"{sha256}{extension}"
+
+
+def content_url(file_type: str, sha256: str, extension: str) -> str:
+    return f"/uploads/{file_type}s/{sha256[:2]}/{sha256}{extension}"
+
+
+def find_by_hash(file_type: str, sha256: str) -> Optional[str]:
+    """URL of an already stored file with this SHA-256, if any."""
+    sha256 = sha256.lower()
+    if file_type not in ALLOWED_EXTENSIONS or not _SHA256_RE.match(sha256):
+        return None
+    for path in (UPLOAD_DIR / f"{file_type}s" / sha256[:2]).glob(f"{sha256}.*"):
+        if path.suffix in ALLOWED_EXTENSIONS[file_type]:
+            _touch(path)
+            return content_url(file_type, sha256, path.suffix)
+    return None
+
+
+def content_etag(path) -> Optional[str]:
+    """
+    Strong ETag for a stored file: the SHA-256 its name is made of. Unlike
+    one derived from the mtime it survives ``_touch``. None for files that
+    predate the content-addressed store.
+    """
+    sha256 = Path(path).stem
+    return f'"{sha256}"' if _SHA256_RE.match(sha256) else None
+
+
+def _touch(path: Path) -> None:
+    """
+    Refresh the mtime of a stored file that is being handed out again. The
+    garbage collector never removes files modified within its grace period,
+    so an unreferenced file stays put until the client saves its article.
+    """
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def commit_to_store(tmp_name: str, file_type: str, extension: str, sha256: str, size: int) -> StoredUpload:
+    """Move a fully written temp file to its content address (or drop it as a duplicate)."""
+    destination = content_path(file_type, sha256, extension)
+    url = content_url(file_type, sha256, extension)
+    if destination.exists():
+        os.unlink(tmp_name)
+        _touch(destination)
+        return StoredUpload(url, size, sha256, True)
+    destination.parent.mkdir(exist_ok=True)
+    os.replace(tmp_name, destination)
+    return StoredUpload(url, size, sha256, False)
+
+
+async def stream_to_store(
+    chunks: AsyncIterator[bytes],
+    file_type: str,
+    extension: str,
+    max_size: int,
+) -> StoredUpload:
+    """
+    Copy the file in ``chunks`` into the content-addressed store as it arrives.
+
+    Raises ``UploadTooLarge`` as soon as more than ``max_size`` bytes have
+    been received; the partial file is removed.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=UPLOAD_TMP_DIR, suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge(max_size)
+                digest.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+        return await run_in_threadpool(
+            commit_to_store, tmp_name, file_type, extension, digest.hexdigest(), size)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    StaticFiles for the uploads mount. Upload paths are never reused for
+    different content, so every response may be cached indefinitely, and
+    content-addressed files carry their hash as the ETag.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        etag = content_etag(full_path)
+        if etag:
+            response.headers["etag"] = etag
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def content_upload_urls(content: Optional[List[dict]]) -> Set[str]:
+    """Upload URLs used by the images/videos of a list of content blocks."""
+    urls = set()
+    for block in content or []:
+        for url in (block.get("images") or []) + (block.get("videos") or []):
+            if url and url.startswith("/uploads/"):
+                urls.add(url)
+    return urls
+
+
+def sync_upload_references(db: Session, article: Article) -> None:
+    """Make the upload_references rows of ``article`` match its content."""
+    wanted = content_upload_urls(article.content)
+    existing = {
+        ref.url: ref
+        for ref in db.query(UploadReference).filter(
+            UploadReference.article_id == article.id)
+    }
+    for url, ref in existing.items():
+        if url not in wanted:
+            db.delete(ref)
+    for url in wanted - existing.keys():
+        db.add(UploadReference(article_id=article.id, url=url))
+
+
+def backfill_upload_references(db: Session) -> int:
+    """
+    Fill an empty upload_references table from the articles' content and
+    return the number of rows added. Tables created before the migrations
+    (then stamped) never ran the 0003 backfill, and until it has run the
+    references say nothing about which files are in use.
+    """
+    if db.query(UploadReference.id).limit(1).first() is not None:
+        return 0
+    rows = [
+        {"article_id": article_id, "url": url}
+        for article_id, content in db.query(Article.id, Article.content)
+        for url in content_upload_urls(content)
+    ]
+    if rows:
+        db.execute(insert(UploadReference), rows)
+        db.commit()
+    return len(rows)
+
+
+def referencing_articles(db: Session, urls: Iterable[str]) -> List[int]:
+    """IDs of articles whose content uses any of ``urls``."""
+    rows = (
+        db.query(UploadReference.article_id)
+        .filter(UploadReference.url.in_(list(urls)))
+        .distinct()
+        .all()
+    )
+    return [row.article_id for row in rows]
+
+
+class MultipartUploadError(Exception):
+    """A multipart upload request that cannot be fulfilled."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class MultipartUploadStore:
+    """
+    Resumable uploads kept as a session directory per upload on local disk.
+
+    Layout: ``<root>/<upload_id>/session.json`` plus ``part-00001`` (data)
+    and ``part-00001.sha256`` (its digest) for every received part. Parts are
+    written to a temp name and renamed, so a retried or parallel upload of
+    the same part never leaves a mix of two attempts.
+    """
+
+    MAX_PARTS = 10000
+    _ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+    def __init__(self, root: Path = MULTIPART_DIR, max_part_size: int = 64 * 1024 * 1024):
+        self.root = root
+        self.max_part_size = max_part_size
+
+    def _session_dir(self, upload_id: str) -> Path:
+        if not self._ID_RE.match(upload_id):
+            raise MultipartUploadError(404, "Upload not found")
+        path = self.root / upload_id
+        if not (path / "session.json").is_file():
+            raise MultipartUploadError(404, "Upload not found")
+        return path
+
+    def _part_path(self, session_dir: Path, part_number: int) -> Path:
+        if not 1 <= part_number <= self.MAX_PARTS:
+            raise MultipartUploadError(
+                400, f"part_number must be between 1 and {self.MAX_PARTS}")
+        return session_dir / f"part-{part_number:05d}"
+
+    def create(self, filename: str, file_type: str, extension: str, max_size: int) -> Dict:
+        upload_id = uuid.uuid4().hex
+        session_dir = self.root / upload_id
+        session_dir.mkdir(parents=True)
+        session = {
+            "upload_id": upload_id,
+            "filename": filename,
+            "file_type": file_type,
+            "extension": extension,
+            "max_size": max_size,
+            "max_part_size": self.max_part_size,
+        }
+        (session_dir / "session.json").write_text(json.dumps(session))
+        return session
+
+    def load(self, upload_id: str) -> Dict:
+        session_dir = self._session_dir(upload_id)
+        return json.loads((session_dir / "session.json").read_text())
+
+    def list_parts(self, upload_id: str) -> List[Dict]:
+        session_dir = self._session_dir(upload_id)
+        parts = []
+        for digest_path in sorted(session_dir.glob("part-*.sha256")):
+            part_path = digest_path.with_suffix("")
+            if not part_path.is_file():
+                continue
+            parts.append({
+                "part_number": int(part_path.name.split("-")[1]),
+                "size": part_path.stat().st_size,
+                "sha256": digest_path.read_text(),
+            })
+        return parts
+
+    async def write_part(
+        self,
+        upload_id: str,
+        part_number: int,
+        chunks: AsyncIterator[bytes],
+        expected_sha256: Optional[str] = None,
+    ) -> Dict:
+        """
+        Stream one part to disk, verifying its SHA-256 if one was given.
+
+        Fails with 413 as soon as the part exceeds ``max_part_size`` or the
+        session's parts together (stored and in flight) exceed its
+        ``max_size``; parts racing each other can overshoot by at most the
+        parts in flight.
+        """
+        session_dir = self._session_dir(upload_id)
+        part_path = self._part_path(session_dir, part_number)
+        max_size = self.load(upload_id)["max_size"]
+        received = await run_in_threadpool(self._received_bytes, session_dir, part_path)
+
+        fd, tmp_name = tempfile.mkstemp(dir=session_dir, suffix=".part")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as out:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_part_size:
+                        raise MultipartUploadError(
+                            413, f"Part exceeds the maximum size of {self.max_part_size} bytes")
+                    if received + size > max_size:
+                        raise MultipartUploadError(
+                            413, f"File exceeds the maximum size of {max_size} bytes")
+                    digest.update(chunk)
+                    await run_in_threadpool(out.write, chunk)
+
+            sha256 = digest.hexdigest()
+            if expected_sha256 and expected_sha256.lower() != sha256:
+                raise MultipartUploadError(
+                    400, f"Checksum mismatch for part {part_number}")
+
+            await run_in_threadpool(self._commit_part, tmp_name, part_path, sha256)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+
+        return {"part_number": part_number, "size": size, "sha256": sha256}
+
+    @staticmethod
+    def _received_bytes(session_dir: Path, exclude: Path) -> int:
+        """Bytes of the session's parts other than ``exclude``, including temp files being written."""
+        total = 0
+        for path in session_dir.iterdir():
+            if path == exclude or path.name == "session.json" or path.suffix in (".sha256", ".tmp"):
+                continue
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    @staticmethod
+    def _commit_part(tmp_name: str, part_path: Path, sha256: str) -> None:
+        """
+        Move a received part into place, then its digest sidecar. Both are
+        renames, so neither is ever seen half written; when two uploads of
+        the same part race, the pair may briefly disagree, which is why
+        ``complete`` checks the digests it computes, not the sidecars.
+        """
+        os.replace(tmp_name, part_path)
+        sidecar = Path(f"{part_path}.sha256")
+        tmp = sidecar.with_name(f".{sidecar.name}.tmp")
+        tmp.write_text(sha256)
+        tmp.replace(sidecar)
+
+    async def complete(
+        self,
+        upload_id: str,
+        expected_parts: Optional[List[Dict]] = None,
+    ) -> StoredUpload:
+        """
+        Concatenate all parts into the content-addressed store.
+
+        Parts must be numbered 1..N without gaps. ``expected_parts`` (the
+        client's list of ``part_number``/``sha256``) is checked if given,
+        against digests computed from the part files while they are copied.
+        """
+        session = self.load(upload_id)
+        session_dir = self.root / upload_id
+        parts = await run_in_threadpool(self.list_parts, upload_id)
+        if not parts:
+            raise MultipartUploadError(400, "No parts have been uploaded")
+
+        numbers = [p["part_number"] for p in parts]
+        if numbers != list(range(1, len(parts) + 1)):
+            raise MultipartUploadError(
+                400, f"Missing parts; received {numbers}")
+
+        expected = None
+        if expected_parts is not None:
+            expected = {p["part_number"]: p["sha256"].lower()
+                        for p in expected_parts}
+            if set(expected) != set(numbers):
+                raise MultipartUploadError(
+                    400, "Uploaded parts do not match the expected parts")
+
+        total = sum(p["size"] for p in parts)
+        if total > session["max_size"]:
+            raise MultipartUploadError(
+                413, f"File exceeds the maximum size of {session['max_size']} bytes")
+
+        stored = await run_in_threadpool(
+            self._assemble, session, session_dir, numbers, expected)
+        await run_in_threadpool(shutil.rmtree, session_dir, True)
+        return stored
+
+    def _assemble(self, session: Dict, session_dir: Path, numbers: List[int],
+                  expected: Optional[Dict[int, str]]) -> StoredUpload:
+        fd, tmp_name = tempfile.mkstemp(dir=UPLOAD_TMP_DIR, suffix=".part")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for number in numbers:
+                    part_digest = hashlib.sha256()
+                    with open(self._part_path(session_dir, number), "rb") as part:
+                        while True:
+                            chunk = part.read(CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            size += len(chunk)
+                            if size > session["max_size"]:
+                                raise MultipartUploadError(
+                                    413, f"File exceeds the maximum size of {session['max_size']} bytes")
+                            digest.update(chunk)
+                            part_digest.update(chunk)
+                            out.write(chunk)
+                    if expected is not None and part_digest.hexdigest() != expected[number]:
+                        raise MultipartUploadError(
+                            400, "Uploaded parts do not match the expected parts")
+            return commit_to_store(
+                tmp_name, session["file_type"], session["extension"],
+                digest.hexdigest(), size)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def abort(self, upload_id: str) -> None:
+        shutil.rmtree(self._session_dir(upload_id))
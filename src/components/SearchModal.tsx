@@ -71,7 +71,7 @@ export function SearchModal({ isOpen, onClose }: SearchModalProps) {
 
         // Fetch published articles
         const articlesResponse = await fetch(
-          `${baseUrl}/api/articles?is_published=true`
+          `${baseUrl}/api/articles/index?is_published=true`
         );
         if (articlesResponse.ok) {
           const articlesData = await articlesResponse.json();
@@ -95,7 +95,7 @@ export function ChatWidget() {
 
         // Fetch published articles
         const articlesResponse = await fetch(
-          `${baseUrl}/api/articles?is_published=true`
+          `${baseUrl}/api/articles/index?is_published=true`
         );
         if (articlesResponse.ok) {
           const articlesData = await articlesResponse.json();
@@ -13,6 +13,12 @@ interface ContentBlock {
   videos?: string[] | null;
 }
 
+interface ImageVariant {
+  url: string;
+  width: number;
+  format: string;
+}
+
 interface Article {
   id: number;
   title: string;
@@ -26,8 +32,22 @@ interface Article {
     name: string;
     color?: string;
   };
+  image_variants?: Record<string, ImageVariant[]> | null;
 }
 
+const apiUrl = (path: string) => `${import.meta.env.VITE_API_URL || ""}${path}`;
+
+// Build a srcset for one format from the variants of an image. The original
+// (recorded with format "original") keeps its own PNG/JPEG type, so it only
+// goes in the <img> srcset, never in a typed avif/webp <source>.
+const srcSetFor = (variants: ImageVariant[], format: string) =>
+  variants
+    .filter((v) => v.format === format)
+    .map((v) => `${apiUrl(v.url)} ${v.width}w`)
+    .join(", ");
+
+const IMAGE_SIZES = "(max-width: 640px) 100vw, 512px";
+
 export default function ArticleView() {
   const { slug } = useParams<{ slug: string }>();
   const [article, setArticle] = useState<Article | null>(null);
@@ -178,11 +198,36 @@ export default function ArticleView() {
                       key={imgIndex}
                       className="overflow-hidden max-w-lg border-0 pt-9"
                     >
-                      <img
-                        src={`${import.meta.env.VITE_API_URL || ""}${imageUrl}`}
-                        alt={`${block.title} - Image ${imgIndex + 1}`}
-                        className="w-full h-auto max-h-96 object-contain rounded-xl"
-                      />
+                      <picture>
+                        {["avif", "webp"].map((format) => {
+                          const srcSet = srcSetFor(
+                            article.image_variants?.[imageUrl] || [],
+                            format
+                          );
+                          return srcSet ? (
+                            <source
+                              key={format}
+                              type={`image/${format}`}
+                              srcSet={srcSet}
+                              sizes={IMAGE_SIZES}
+                            />
+                          ) : null;
+                        })}
+                        <img
+                          src={apiUrl(imageUrl)}
+                          srcSet={
+                            srcSetFor(
+                              article.image_variants?.[imageUrl] || [],
+                              "original"
+                            ) || undefined
+                          }
+                          sizes={IMAGE_SIZES}
+                          alt={`${block.title} - Image ${imgIndex + 1}`}
+                          loading="lazy"
+                          decoding="async"
+                          className="w-full h-auto max-h-96 object-contain rounded-xl"
+                        />
+                      </picture>
                     </Card>
                   ))}
                 </div>
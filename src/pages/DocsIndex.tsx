@@ -61,7 +61,7 @@ export default function DocsIndex() {
 
         // Fetch all published articles
         const articlesResponse = await fetch(
-          `${baseUrl}/api/articles?is_published=true`
+          `${baseUrl}/api/articles/index?is_published=true`
         );
         const articlesData = await articlesResponse.json();
 
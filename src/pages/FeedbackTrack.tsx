@@ -51,7 +51,9 @@ export default function FeedbackTrack() {
   const fetchFeedback = async (token: string) => {
     try {
       const baseUrl = import.meta.env.VITE_API_URL || "";
-      const response = await fetch(`${baseUrl}/api/feedback/${token}`);
+      const response = await fetch(`${baseUrl}/api/feedback/${token}`, {
+        credentials: "include",
+      });
 
       if (response.ok) {
         const data = await response.json();
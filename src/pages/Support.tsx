@@ -82,7 +82,7 @@ export default function Support() {
 
         // Fetch published articles
         const articlesResponse = await fetch(
-          `${baseUrl}/api/articles?is_published=true`
+          `${baseUrl}/api/articles/index?is_published=true`
         );
         if (articlesResponse.ok) {
           const articlesData = await articlesResponse.json();
@@ -125,6 +125,7 @@ export default function Support() {
       const baseUrl = import.meta.env.VITE_API_URL || "";
       const response = await fetch(`${baseUrl}/api/feedback/submit`, {
         method: "POST",
+        credentials: "include",
         headers: {
           "Content-Type": "application/json",
         },
@@ -110,7 +110,7 @@ export default function Articles() {
   const fetchArticles = async () => {
     try {
       const baseUrl = import.meta.env.VITE_API_URL || "";
-      const response = await fetch(`${baseUrl}/api/articles`);
+      const response = await fetch(`${baseUrl}/api/articles`, { credentials: "include" });
 
       if (!response.ok) {
         throw new Error("Failed to fetch articles");
@@ -156,7 +156,7 @@ export default function Articles() {
   const fetchCategories = async () => {
     try {
       const baseUrl = import.meta.env.VITE_API_URL || "";
-      const response = await fetch(`${baseUrl}/api/categories`);
+      const response = await fetch(`${baseUrl}/api/categories`, { credentials: "include" });
 
       if (!response.ok) {
         throw new Error("Failed to fetch categories");
@@ -265,6 +265,17 @@ export default function Articles() {
     setContentBlocks(updated);
   };
 
+  // SHA-256 of a file as hex, used to skip uploading content the server already has
+  const hashFile = async (file: File): Promise<string> => {
+    const digest = await crypto.subtle.digest(
+      "SHA-256",
+      await file.arrayBuffer()
+    );
+    return Array.from(new Uint8Array(digest))
+      .map((b) => b.toString(16).padStart(2, "0"))
+      .join("");
+  };
+
   // File upload for content block
   const handleFileUpload = async (
     files: FileList | null,
@@ -280,6 +291,21 @@ export default function Articles() {
     try {
       for (let i = 0; i < files.length; i++) {
         const file = files[i];
+
+        // Files up to 64 MB are hashed first; known content is not re-sent
+        if (crypto?.subtle && file.size <= 64 * 1024 * 1024) {
+          const sha256 = await hashFile(file);
+          const lookup = await fetch(
+            `${baseUrl}/api/upload/lookup?file_type=${fileType}&sha256=${sha256}`,
+            { credentials: "include" }
+          );
+          if (lookup.ok) {
+            const existing = await lookup.json();
+            uploadedUrls.push(existing.url);
+            continue;
+          }
+        }
+
         const formDataUpload = new FormData();
         formDataUpload.append("file", file);
 
@@ -287,6 +313,7 @@ export default function Articles() {
           `${baseUrl}/api/upload?file_type=${fileType}`,
           {
             method: "POST",
+            credentials: "include",
             body: formDataUpload,
           }
         );
@@ -394,6 +421,7 @@ export default function Articles() {
           `${baseUrl}/api/articles/${editingArticle.id}`,
           {
             method: "PUT",
+            credentials: "include",
             headers: {
               "Content-Type": "application/json",
             },
@@ -440,6 +468,7 @@ export default function Articles() {
 
         const response = await fetch(`${baseUrl}/api/articles`, {
           method: "POST",
+          credentials: "include",
           headers: {
             "Content-Type": "application/json",
           },
@@ -476,6 +505,7 @@ export default function Articles() {
       const baseUrl = import.meta.env.VITE_API_URL || "";
       const response = await fetch(`${baseUrl}/api/articles/${id}`, {
         method: "DELETE",
+        credentials: "include",
       });
 
       if (!response.ok) {
@@ -511,6 +541,7 @@ export default function Articles() {
       const baseUrl = import.meta.env.VITE_API_URL || "";
       const response = await fetch(`${baseUrl}/api/articles/${id}`, {
         method: "PUT",
+        credentials: "include",
         headers: {
           "Content-Type": "application/json",
         },
@@ -548,6 +579,7 @@ export default function Articles() {
       const baseUrl = import.meta.env.VITE_API_URL || "";
       const response = await fetch(`${baseUrl}/api/articles/${id}`, {
         method: "PUT",
+        credentials: "include",
         headers: {
           "Content-Type": "application/json",
         },
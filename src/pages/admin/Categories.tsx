@@ -71,7 +71,7 @@ export default function Categories() {
   const fetchCategories = async () => {
     try {
       const baseUrl = import.meta.env.VITE_API_URL || "";
-      const response = await fetch(`${baseUrl}/api/categories`);
+      const response = await fetch(`${baseUrl}/api/categories`, { credentials: "include" });
 
       if (!response.ok) {
         throw new Error("Failed to fetch categories");
@@ -139,6 +139,7 @@ export default function Categories() {
           `${baseUrl}/api/categories/${editingCategory.id}`,
           {
             method: "PUT",
+            credentials: "include",
             headers: {
               "Content-Type": "application/json",
             },
@@ -184,6 +185,7 @@ export default function Categories() {
         const baseUrl = import.meta.env.VITE_API_URL || "http://localhost:3001";
         const response = await fetch(`${baseUrl}/api/categories`, {
           method: "POST",
+          credentials: "include",
           headers: {
             "Content-Type": "application/json",
           },
@@ -236,6 +238,7 @@ export default function Categories() {
         `${baseUrl}/api/categories/${categoryToDelete.id}`,
         {
           method: "DELETE",
+          credentials: "include",
         }
       );
 
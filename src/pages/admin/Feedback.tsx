@@ -62,6 +62,8 @@ interface FeedbackItem {
 export default function Feedback() {
   const [feedback, setFeedback] = useState<FeedbackItem[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedFeedback, setSelectedFeedback] = useState<FeedbackItem | null>(
     null
   );
@@ -75,15 +77,21 @@ export default function Feedback() {
     fetchFeedback();
   }, []);
 
-  const fetchFeedback = async () => {
+  const fetchFeedback = async (cursor?: string) => {
     try {
-      setLoading(true);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
       const baseUrl = import.meta.env.VITE_API_URL || "";
-      const response = await fetch(`${baseUrl}/api/feedback`);
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+      const response = await fetch(`${baseUrl}/api/feedback${query}`, { credentials: "include" });
 
       if (response.ok) {
         const data = await response.json();
-        setFeedback(data);
+        setFeedback((previous) => (cursor ? [...previous, ...data] : data));
+        setNextCursor(response.headers.get("X-Next-Cursor"));
       }
     } catch (error) {
       console.error("Failed to fetch feedback:", error);
@@ -94,6 +102,7 @@ export default function Feedback() {
       });
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -127,6 +136,7 @@ export default function Feedback() {
       const baseUrl = import.meta.env.VITE_API_URL || "";
       const response = await fetch(`${baseUrl}/api/feedback/${feedbackId}`, {
         method: "PUT",
+        credentials: "include",
         headers: {
           "Content-Type": "application/json",
         },
@@ -166,6 +176,7 @@ export default function Feedback() {
         `${baseUrl}/api/feedback/${selectedFeedback.id}`,
         {
           method: "PUT",
+          credentials: "include",
           headers: {
             "Content-Type": "application/json",
           },
@@ -360,6 +371,17 @@ export default function Feedback() {
               </TableBody>
             </Table>
           )}
+          {!loading && nextCursor && (
+            <div className="flex justify-center pt-4">
+              <Button
+                variant="outline"
+                onClick={() => fetchFeedback(nextCursor)}
+                disabled={loadingMore}
+              >
+                {loadingMore ? "Loading..." : "Load more"}
+              </Button>
+            </div>
+          )}
         </CardContent>
       </Card>
 